@@ -3,53 +3,158 @@ Core V3: Karabiner-Elements JSON Generator.
 
 This module provides a functional API and data structures to generate complex
 Karabiner-Elements rules.
+
+Requires Python 3.10 or newer: the data structures are slotted dataclasses
+(dataclass(slots=True)).
 """
 
+import json
+import re
+import sys
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Union
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 from enum import Enum
 
+if sys.version_info < (3, 10):
+    raise ImportError("src.core requires Python 3.10 or newer (dataclass slots=True).")
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Options for simultaneous inputs, copied into each rule that uses them.
+_SIMUL_OPTIONS: Dict[str, Any] = {
+    "key_down_order": "insensitive",
+    "detect_key_down_uninterruptedly": True
+}
+
+_K_TO_IF_ALONE_TIMEOUT = sys.intern("basic.to_if_alone_timeout_milliseconds")
+
+# Manipulator skeletons, shallow-copied per rule so each dict is created at its
+# final size with keys in output order. Every None slot is filled or removed.
+_BASE_TEMPLATE: Dict[str, Any] = {"type": "basic", "from": None, "conditions": None}
+_DUAL_TEMPLATE: Dict[str, Any] = {
+    "type": "basic",
+    "from": None,
+    "conditions": None,
+    "to": None,
+    "to_after_key_up": None,
+    "to_if_alone": None,
+    "parameters": None
+}
+
+
+def _intern(name: str) -> str:
+    """
+    Interns a modifier or variable name, accepting str subclasses.
+
+    sys.intern rejects str subclasses such as str-based enums, so the name is
+    first reduced to its plain str value (str.__str__, unlike str(), never
+    yields an enum's "Class.MEMBER" form).
+
+    Args:
+        name: The name to intern.
+
+    Returns:
+        The interned plain string.
+    """
+    return sys.intern(str.__str__(name))
+
+
+def _intern_modifiers(modifiers: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Normalizes a modifier sequence into a tuple of interned names.
+
+    Args:
+        modifiers: The modifier names, as any sequence.
+
+    Returns:
+        A tuple of interned modifier names.
+
+    Raises:
+        ValueError: If modifiers is a bare string, which would otherwise be
+            split into one modifier per character.
+    """
+    if isinstance(modifiers, str):
+        raise ValueError(f"Modifiers must be a sequence of names, not the string {modifiers!r}.")
+    return tuple(map(_intern, modifiers))
+
 # ==============================================================================
 # DATA STRUCTURES
 # ==============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActionEvent:
     """
     Represents a single, atomic event within an action sequence.
 
     Attributes:
         key_code: The key or button identifier (e.g., 'a', 'left_command', 'button1').
-        modifiers: List of modifier keys to hold during this event.
+        modifiers: Modifier keys to hold during this event (lists are stored as tuples).
         shell_command: A raw shell command to execute.
         hold_down_milliseconds: Duration to hold the input.
     """
     key_code: Optional[str] = None
-    modifiers: List[str] = field(default_factory=list)
+    modifiers: Sequence[str] = ()
     shell_command: Optional[str] = None
     hold_down_milliseconds: int = 0
+    _event_key: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Sequences are stored as tuples so the event stays hashable. Modifier
+        # names are interned: configs loaded at runtime share one string each.
+        # The default () needs neither.
+        if self.modifiers != ():
+            object.__setattr__(self, "modifiers", _intern_modifiers(self.modifiers))
+        _check_milliseconds(self.hold_down_milliseconds, "hold_down_milliseconds", self.key_code, "Event")
+        # Resolve pointing_button vs key_code once instead of on every compile.
+        if self.key_code:
+            object.__setattr__(self, "_event_key", _payload_key(self.key_code))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Action:
     """
     Container for output commands.
 
     Attributes:
-        key_code: Single key/button string or list of strings (Simple Mode).
+        key_code: Single key/button string or sequence of strings (Simple Mode).
         modifiers: Modifiers applied globally to the key_code inputs.
         shell_command: Raw shell command string.
-        events: List of ActionEvents for complex sequences (Complex Mode).
+        events: ActionEvents for complex sequences (Complex Mode).
+
+    Sequence fields accept lists and are stored as tuples.
     """
-    key_code: Optional[Union[str, List[str]]] = None
-    modifiers: List[str] = field(default_factory=list)
+    key_code: Optional[Union[str, Sequence[str]]] = None
+    modifiers: Sequence[str] = ()
     shell_command: Optional[str] = None
-    events: List[ActionEvent] = field(default_factory=list)
-
-
-class ButtonBehavior(Enum):
+    events: Sequence[ActionEvent] = ()
+    _keys: Tuple[Tuple[str, str], ...] = field(default=(), init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Sequences are stored as tuples so the action stays hashable.
+        if isinstance(self.key_code, list):
+            object.__setattr__(self, "key_code", tuple(self.key_code))
+        if self.modifiers != ():
+            object.__setattr__(self, "modifiers", _intern_modifiers(self.modifiers))
+        if type(self.events) is not tuple:
+            object.__setattr__(self, "events", tuple(self.events))
+        # Normalize the Simple Mode inputs once so serialization needs no type checks.
+        if isinstance(self.key_code, str):
+            object.__setattr__(self, "_keys", ((_payload_key(self.key_code), self.key_code),))
+        elif self.key_code:
+            object.__setattr__(self, "_keys", tuple((_payload_key(k), k) for k in self.key_code))
+
+
+class ButtonBehavior(str, Enum):
     """
     Enumeration of interaction archetypes.
+
+    Members are strings, so they compare equal to their values ("click",
+    "dual", ...) and serialize to JSON without .value. str() and f-strings
+    also yield the bare value on every Python version.
     """
     CLICK = "click"
     MODIFIER = "modifier"
@@ -57,40 +162,102 @@ class ButtonBehavior(Enum):
     VIRTUAL = "virtual"
     SIMULTANEOUS = "simultaneous"
 
+    # Enum would render "ButtonBehavior.CLICK" (and Python 3.11 changed
+    # format() to match), so defer to str for both.
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+# Behaviors that toggle a layer variable and therefore require one.
+_LAYER_BEHAVIORS = frozenset({ButtonBehavior.MODIFIER, ButtonBehavior.DUAL, ButtonBehavior.VIRTUAL})
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ButtonConfig:
     """
     Configuration blueprint for a physical input rule.
 
     Attributes:
-        button_id: Input identifier(s). String for single input, List for simultaneous.
-        behavior: The interaction archetype (CLICK, DUAL, etc).
+        button_id: Input identifier(s). String for single input, sequence for simultaneous.
+        behavior: The interaction archetype (CLICK, DUAL, etc), or its string value.
         tap_action: The Action to execute on a tap event.
         layer_variable: The variable name to toggle for modifier layers.
         threshold_ms: Input latency threshold for dual-role triggers.
         mandatory_modifiers: Hardware modifiers required to trigger this rule.
         simultaneous_threshold_ms: Time window for simultaneous detection.
+        optional_modifiers: Modifiers that may be held without blocking the rule
+            (e.g. ("any",) to fire regardless of held modifiers).
+        layer_condition: Layer variable that must be active (== 1) for the rule.
+        app_restriction: Frontmost app regex(es) the rule is limited to; strings,
+            compiled patterns or a sequence of either, stored as a tuple of
+            regex strings. Empty values are stored as None.
+
+    Sequence fields accept lists and are stored as tuples.
     """
-    button_id: Union[str, List[str]]
-    behavior: ButtonBehavior
+    button_id: Union[str, Sequence[str]]
+    behavior: Union[ButtonBehavior, str]
     tap_action: Optional[Action] = None
     layer_variable: Optional[str] = None
     threshold_ms: int = 200
-    mandatory_modifiers: List[str] = field(default_factory=list)
+    mandatory_modifiers: Sequence[str] = ()
     simultaneous_threshold_ms: int = 50
+    optional_modifiers: Sequence[str] = ()
+    layer_condition: Optional[str] = None
+    app_restriction: Optional[Union[str, re.Pattern, Sequence[Union[str, re.Pattern]]]] = None
+    _from_inputs: Tuple[Tuple[str, str], ...] = field(default=(), init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Accept raw strings ("click", "dual", ...); unknown values raise ValueError.
+        if type(self.behavior) is not ButtonBehavior:
+            object.__setattr__(self, "behavior", ButtonBehavior(self.behavior))
+        # Sequences are stored as tuples so the config stays hashable.
+        if isinstance(self.button_id, list):
+            object.__setattr__(self, "button_id", tuple(self.button_id))
+        if self.mandatory_modifiers != ():
+            object.__setattr__(self, "mandatory_modifiers", _intern_modifiers(self.mandatory_modifiers))
+        if self.optional_modifiers != ():
+            object.__setattr__(self, "optional_modifiers", _intern_modifiers(self.optional_modifiers))
+        if self.layer_variable:
+            object.__setattr__(self, "layer_variable", _intern(self.layer_variable))
+        # Empty restrictions ("", [], ()) mean "no restriction" and become None.
+        if self.layer_condition is not None:
+            object.__setattr__(
+                self, "layer_condition", _intern(self.layer_condition) if self.layer_condition else None
+            )
+        if self.app_restriction is not None:
+            apps = tuple(filter(None, _bundle_identifiers(self.app_restriction)))
+            object.__setattr__(self, "app_restriction", apps or None)
+        _validate_config(self)
+        # Pair each input with its event key once; the 'from' block reuses them.
+        if isinstance(self.button_id, str):
+            object.__setattr__(self, "_from_inputs", ((_payload_key(self.button_id), self.button_id),))
+        else:
+            object.__setattr__(self, "_from_inputs", tuple((_payload_key(b), b) for b in self.button_id))
+
+    def compile(self) -> Callable[..., Dict[str, Any]]:
+        """
+        Binds this config to its behavior's compiler.
+
+        Behavior dispatch is resolved once here. Like compile_rule, the
+        returned callable builds a new manipulator on every call.
+
+        Returns:
+            A callable taking (vid, pid, conditions=()) and returning a
+            manipulator dictionary.
+        """
+        return partial(_build_rule, _DISPATCH[self.behavior], self)
 
 
 # ==============================================================================
 # FACTORY FUNCTIONS
 # ==============================================================================
 
-def make_seq(events: List[ActionEvent]) -> Action:
+def make_seq(events: Sequence[ActionEvent]) -> Action:
     """
     Factory function to create a complex Action sequence.
 
     Args:
-        events: A list of ActionEvent objects.
+        events: A sequence of ActionEvent objects.
 
     Returns:
         An Action object configured for complex execution.
@@ -98,18 +265,57 @@ def make_seq(events: List[ActionEvent]) -> Action:
     return Action(events=events)
 
 
-def add_app_restriction(manipulator: Dict[str, Any], app_id: Optional[str]) -> None:
+def make_app_condition(app_id: Union[str, re.Pattern, Sequence[Union[str, re.Pattern]]]) -> Dict[str, Any]:
+    """
+    Factory function to create a 'frontmost_application_if' condition.
+
+    The result can be built once and appended to many manipulators, as long
+    as none of them mutate it.
+
+    Args:
+        app_id: The regex for the application bundle identifier, as a string
+            or compiled pattern, or a sequence of them. Karabiner matches if
+            any entry matches, so a list of anchored literals replaces a regex
+            alternation.
+
+    Returns:
+        A condition dictionary for a manipulator's conditions list.
+    """
+    return {"type": "frontmost_application_if", "bundle_identifiers": list(_bundle_identifiers(app_id))}
+
+
+def make_layer_condition(layer_name: str, value: int = 1) -> Dict[str, Any]:
+    """
+    Factory function to create a 'variable_if' condition.
+
+    The result can be built once and appended to many manipulators, as long
+    as none of them mutate it.
+
+    Args:
+        layer_name: The name of the variable to check.
+        value: The required value (1 or 0).
+
+    Returns:
+        A condition dictionary for a manipulator's conditions list.
+    """
+    return {"type": "variable_if", "name": layer_name, "value": value}
+
+
+def add_app_restriction(
+    manipulator: Dict[str, Any],
+    app_id: Optional[Union[str, re.Pattern, Sequence[Union[str, re.Pattern]]]]
+) -> None:
     """
     Injects a 'frontmost_application_if' condition into a manipulator.
 
     Args:
-        manipulator: The rule dictionary to modify.
-        app_id: The regex string for the application bundle identifier.
+        manipulator: The rule dictionary to modify, as returned by compile_rule.
+        app_id: The regex for the application bundle identifier, or a
+            sequence of them (see make_app_condition).
     """
     if not app_id:
         return
-    condition = {"type": "frontmost_application_if", "bundle_identifiers": [app_id]}
-    manipulator.setdefault("conditions", []).append(condition)
+    manipulator["conditions"].append(make_app_condition(app_id))
 
 
 def add_layer_condition(manipulator: Dict[str, Any], layer_name: str, value: int = 1) -> None:
@@ -117,82 +323,183 @@ def add_layer_condition(manipulator: Dict[str, Any], layer_name: str, value: int
     Injects a 'variable_if' condition into a manipulator.
 
     Args:
-        manipulator: The rule dictionary to modify.
+        manipulator: The rule dictionary to modify, as returned by compile_rule.
         layer_name: The name of the variable to check.
         value: The required value (1 or 0).
     """
-    condition = {"type": "variable_if", "name": layer_name, "value": value}
-    manipulator.setdefault("conditions", []).append(condition)
+    manipulator["conditions"].append(make_layer_condition(layer_name, value))
 
 
 # ==============================================================================
 # INTERNAL LOGIC
 # ==============================================================================
 
-def _create_event_payload(key_or_btn: str) -> Dict[str, Any]:
+def _validate_config(config: ButtonConfig) -> None:
+    """
+    Checks a ButtonConfig up front so malformed configs fail at construction
+    rather than partway through compiling a batch.
+
+    Args:
+        config: The ButtonConfig object, with behavior and sequences normalized.
+
+    Raises:
+        ValueError: If a field is missing, empty, of the wrong type, or
+            inconsistent with the behavior.
+    """
+    button_id = config.button_id
+    if isinstance(button_id, str):
+        valid_id = bool(button_id)
+    else:
+        valid_id = isinstance(button_id, tuple) and bool(button_id) and all(isinstance(b, str) and b for b in button_id)
+    if not valid_id:
+        raise ValueError(f"Invalid button_id {button_id!r}: expected a non-empty string or list of strings.")
+
+    if config.behavior is ButtonBehavior.SIMULTANEOUS and not isinstance(config.button_id, tuple):
+        raise ValueError("Simultaneous behavior requires a list of button_ids")
+    if config.behavior is not ButtonBehavior.SIMULTANEOUS and isinstance(config.button_id, tuple):
+        raise ValueError(
+            f"Button {config.button_id} configured as {config.behavior.value}: only simultaneous "
+            "behavior accepts a list of button_ids."
+        )
+
+    if config.behavior in _LAYER_BEHAVIORS and not config.layer_variable:
+        raise ValueError(
+            f"Button {config.button_id} configured as {config.behavior.value} but missing layer_variable."
+        )
+
+    # Only layer behaviors emit threshold_ms, so the others may leave it None;
+    # simultaneous_threshold_ms is not emitted at all.
+    if config.threshold_ms is not None or config.behavior in _LAYER_BEHAVIORS:
+        _check_milliseconds(config.threshold_ms, "threshold_ms", button_id)
+    if config.simultaneous_threshold_ms is not None:
+        _check_milliseconds(config.simultaneous_threshold_ms, "simultaneous_threshold_ms", button_id)
+
+
+def _check_milliseconds(value: Any, name: str, owner: Any, kind: str = "Button") -> None:
     """
-    Creates the correct JSON payload key based on the input string.
+    Checks that a duration field holds a non-negative integer.
+
+    Floats are refused as well: Karabiner expects integer milliseconds, and
+    200.0 == 200 would let an equal config reuse the other's cached output.
+
+    Args:
+        value: The field's value.
+        name: The field name, for the error message.
+        owner: The button or key the field belongs to, for the error message.
+        kind: What owner is ("Button" or "Event"), for the error message.
+
+    Raises:
+        ValueError: If value is not a non-negative int (bools included).
+    """
+    if type(value) is not int or value < 0:
+        raise ValueError(f"{kind} {owner} has an invalid {name} {value!r}: expected a non-negative integer.")
+
+
+def _payload_key(key_or_btn: str) -> str:
+    """
+    Resolves which Karabiner event key addresses the given input.
 
     Args:
         key_or_btn: The input string (e.g., "return_or_enter" or "button1").
 
     Returns:
-        A dictionary with either "pointing_button" or "key_code".
+        "pointing_button" for mouse buttons, "key_code" otherwise.
     """
-    if key_or_btn.startswith("button"):
-        return {"pointing_button": key_or_btn}
-    return {"key_code": key_or_btn}
+    return "pointing_button" if key_or_btn.startswith("button") else "key_code"
 
 
-def _action_to_json(action: Action) -> List[Dict[str, Any]]:
+def _create_event_payload(
+    event_key: str,
+    key_or_btn: str,
+    modifiers: Tuple[str, ...] = (),
+    hold_down_milliseconds: int = 0
+) -> Dict[str, Any]:
     """
-    Serializes an Action object into a list of Karabiner 'to' events.
+    Creates a single Karabiner event payload for a key or pointing button.
+
+    Args:
+        event_key: "pointing_button" or "key_code", as resolved by _payload_key.
+        key_or_btn: The input string (e.g., "return_or_enter" or "button1").
+        modifiers: Modifier keys to hold during the event.
+        hold_down_milliseconds: Duration to hold the input (0 to omit).
+
+    Returns:
+        A dictionary with either "pointing_button" or "key_code", plus the
+        optional "modifiers" and "hold_down_milliseconds" entries.
+    """
+    payload: Dict[str, Any] = {event_key: key_or_btn}
+    if modifiers:
+        payload["modifiers"] = modifiers
+    if hold_down_milliseconds > 0:
+        payload["hold_down_milliseconds"] = hold_down_milliseconds
+    return payload
+
+
+@lru_cache(maxsize=512)
+def _serialize_action(action: Action) -> Tuple[Mapping[str, Any], ...]:
+    """
+    Serializes and memoizes an Action as read-only Karabiner 'to' events.
+
+    Actions recur across many rules (e.g. Cmd+W bound in several layers), so
+    each distinct Action is serialized once.
 
     Args:
         action: The Action object to serialize.
 
     Returns:
-        A list of dictionaries representing the 'to' block in JSON.
+        A tuple of read-only event mappings.
     """
     if action.shell_command:
-        return [{"shell_command": action.shell_command}]
-
-    json_events: List[Dict[str, Any]] = []
+        return (MappingProxyType({"shell_command": action.shell_command}),)
 
     if action.events:
+        json_events: List[Dict[str, Any]] = []
         for event in action.events:
             if event.shell_command:
                 json_events.append({"shell_command": event.shell_command})
-                continue
+            elif event.key_code:
+                json_events.append(_create_event_payload(
+                    event._event_key, event.key_code, event.modifiers, event.hold_down_milliseconds
+                ))
+    else:
+        # Multi-key taps need a short hold so each key registers separately.
+        hold = 20 if len(action._keys) > 1 else 0
+        json_events = [
+            _create_event_payload(event_key, k, action.modifiers, hold) for event_key, k in action._keys
+        ]
 
-            if not event.key_code:
-                continue
+    return tuple(MappingProxyType(payload) for payload in json_events)
 
-            payload = _create_event_payload(event.key_code)
 
-            if event.modifiers:
-                payload["modifiers"] = event.modifiers
-            if event.hold_down_milliseconds > 0:
-                payload["hold_down_milliseconds"] = event.hold_down_milliseconds
-            json_events.append(payload)
-        return json_events
+def _action_to_json(action: Action) -> List[Dict[str, Any]]:
+    """
+    Serializes an Action object into a list of Karabiner 'to' events.
 
-    keys = []
-    if isinstance(action.key_code, str):
-        keys.append(action.key_code)
-    elif isinstance(action.key_code, list):
-        keys = action.key_code
+    Args:
+        action: The Action object to serialize.
 
-    for k in keys:
-        payload = _create_event_payload(k)
+    Returns:
+        A list of dictionaries representing the 'to' block in JSON. The
+        dictionaries are fresh copies and safe to mutate; "modifiers" are
+        emitted as lists, like every other JSON array in a rule.
+    """
+    return [_event_to_json(payload) for payload in _serialize_action(action)]
 
-        if action.modifiers:
-            payload["modifiers"] = action.modifiers
-        if len(keys) > 1:
-             payload["hold_down_milliseconds"] = 20
-        json_events.append(payload)
 
-    return json_events
+def _event_to_json(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Copies a cached event payload into a mutable 'to' event.
+
+    Args:
+        payload: A read-only event mapping from _serialize_action.
+
+    Returns:
+        A new dictionary whose "modifiers" tuple, if any, is a new list.
+    """
+    event = payload.copy()
+    if "modifiers" in event:
+        event["modifiers"] = list(event["modifiers"])
+    return event
 
 
 def _create_from_block(config: ButtonConfig) -> Dict[str, Any]:
@@ -207,60 +514,118 @@ def _create_from_block(config: ButtonConfig) -> Dict[str, Any]:
     """
     from_block = {}
 
-    if config.behavior == ButtonBehavior.SIMULTANEOUS:
-        if not isinstance(config.button_id, list):
-            raise ValueError("Simultaneous behavior requires a list of button_ids")
-
-        simul_events = []
-        for b in config.button_id:
-            if b.startswith("button"):
-                simul_events.append({"pointing_button": b})
-            else:
-                simul_events.append({"key_code": b})
-
-        from_block["simultaneous"] = simul_events
-        from_block["simultaneous_options"] = {
-            "key_down_order": "insensitive",
-            "detect_key_down_uninterruptedly": True
-        }
+    if config.behavior is ButtonBehavior.SIMULTANEOUS:
+        from_block["simultaneous"] = [{key: b} for key, b in config._from_inputs]
+        from_block["simultaneous_options"] = dict(_SIMUL_OPTIONS)
     else:
         if isinstance(config.button_id, str):
-            if config.button_id.startswith("button"):
-                from_block["pointing_button"] = config.button_id
-            else:
-                from_block["key_code"] = config.button_id
+            from_block.update(config._from_inputs)
 
-    if config.mandatory_modifiers:
-        from_block["modifiers"] = {"mandatory": config.mandatory_modifiers}
+    if config.mandatory_modifiers or config.optional_modifiers:
+        modifiers = {}
+        if config.mandatory_modifiers:
+            modifiers["mandatory"] = list(config.mandatory_modifiers)
+        if config.optional_modifiers:
+            modifiers["optional"] = list(config.optional_modifiers)
+        from_block["modifiers"] = modifiers
 
     return from_block
 
 
-def _create_base_manipulator(config: ButtonConfig, vid: int, pid: int) -> Dict[str, Any]:
+def _device_condition(vid: int, pid: int) -> Dict[str, Any]:
     """
-    Creates the base dictionary structure for a Karabiner manipulator.
+    Builds the 'device_if' condition for a Vendor/Product ID pair.
+
+    Each rule gets its own condition: building the literal is cheaper than
+    copying a cached template.
 
     Args:
-        config: The ButtonConfig object.
         vid: The Vendor ID.
         pid: The Product ID.
 
     Returns:
-        A dictionary containing 'type', 'from', and 'conditions'.
+        A dictionary representing the 'device_if' condition.
     """
-    rule = {
-        "type": "basic",
-        "from": _create_from_block(config),
+    return {
+        "type": "device_if",
+        "identifiers": [{"vendor_id": vid, "product_id": pid}]
     }
 
-    if vid and pid:
-        rule["conditions"] = [
-            {
-                "type": "device_if",
-                "identifiers": [{"vendor_id": vid, "product_id": pid}]
-            }
-        ]
 
+def _bundle_identifiers(app_id: Union[str, re.Pattern, Sequence[Union[str, re.Pattern]]]) -> Tuple[str, ...]:
+    """
+    Normalizes app matchers into the regex strings Karabiner expects.
+
+    Compiled patterns are accepted so callers can share one re.Pattern
+    between their own matching and rule generation; only its source
+    string reaches the JSON.
+
+    Args:
+        app_id: A regex string, compiled pattern, or a sequence of either.
+
+    Returns:
+        A tuple of bundle identifier regex strings, in order.
+
+    Raises:
+        ValueError: If a compiled pattern uses flags (e.g. re.IGNORECASE),
+            which its source string cannot carry into the JSON.
+    """
+    if isinstance(app_id, (str, re.Pattern)):
+        app_id = (app_id,)
+    return tuple(_pattern_source(a) if isinstance(a, re.Pattern) else a for a in app_id)
+
+
+def _pattern_source(pattern: re.Pattern) -> str:
+    """
+    Returns a compiled pattern's source string, refusing flags it would lose.
+
+    Args:
+        pattern: The compiled bundle identifier regex.
+
+    Returns:
+        The pattern's source string.
+
+    Raises:
+        ValueError: If the pattern is not a str pattern or has any flag
+            besides the implicit re.UNICODE that its source does not set
+            inline.
+    """
+    if not isinstance(pattern.pattern, str) or pattern.flags != re.compile(pattern.pattern).flags:
+        raise ValueError(
+            f"App pattern {pattern.pattern!r} has flags that cannot be expressed in a "
+            "bundle identifier regex; use inline syntax such as (?i) instead."
+        )
+    return pattern.pattern
+
+
+def _create_base_manipulator(
+    config: ButtonConfig,
+    vid: int,
+    pid: int,
+    template: Dict[str, Any] = _BASE_TEMPLATE
+) -> Dict[str, Any]:
+    """
+    Creates the base dictionary structure for a Karabiner manipulator.
+
+    Args:
+        config: The ButtonConfig object.
+        vid: The Vendor ID.
+        pid: The Product ID.
+        template: The skeleton to copy; its remaining None slots are left
+            for the caller to fill.
+
+    Returns:
+        A dictionary with 'type', 'from', and 'conditions' populated. The
+        config's own layer and app conditions follow the device condition.
+    """
+    rule = template.copy()
+    rule["from"] = _create_from_block(config)
+    conditions = [_device_condition(vid, pid)] if vid and pid else []
+    if config.layer_condition:
+        conditions.append(make_layer_condition(config.layer_condition, 1))
+    if config.app_restriction:
+        conditions.append(make_app_condition(config.app_restriction))
+    rule["conditions"] = conditions
     return rule
 
 
@@ -290,6 +655,10 @@ def compile_dual_rule(config: ButtonConfig, vid: int, pid: int) -> Dict[str, Any
     """
     Compiles a dual-role rule (Tap for Action, Hold for Layer Variable).
 
+    Serves the MODIFIER, DUAL and VIRTUAL behaviors, which all emit the same
+    structure: the layer variable is set while held and the tap action fires
+    when released alone.
+
     Args:
         config: The ButtonConfig object.
         vid: The Vendor ID.
@@ -298,55 +667,94 @@ def compile_dual_rule(config: ButtonConfig, vid: int, pid: int) -> Dict[str, Any
     Returns:
         The complete manipulator dictionary.
     """
-    rule = _create_base_manipulator(config, vid, pid)
-
-    if not config.layer_variable:
-        raise ValueError(f"Button {config.button_id} configured as dual/modifier but missing layer_variable.")
-
+    rule = _create_base_manipulator(config, vid, pid, _DUAL_TEMPLATE)
     rule["to"] = [{"set_variable": {"name": config.layer_variable, "value": 1}}]
     rule["to_after_key_up"] = [{"set_variable": {"name": config.layer_variable, "value": 0}}]
 
     if config.tap_action:
         rule["to_if_alone"] = _action_to_json(config.tap_action)
+    else:
+        del rule["to_if_alone"]
 
     rule["parameters"] = {
-        "basic.to_if_alone_timeout_milliseconds": config.threshold_ms
+        _K_TO_IF_ALONE_TIMEOUT: config.threshold_ms
     }
     return rule
 
 
-def compile_virtual_modifier_rule(config: ButtonConfig, vid: int, pid: int) -> Dict[str, Any]:
+# Behavior -> compiler lookup used by compile_rule.
+_DISPATCH: Dict[ButtonBehavior, Callable[[ButtonConfig, int, int], Dict[str, Any]]] = {
+    ButtonBehavior.CLICK: compile_click_rule,
+    ButtonBehavior.MODIFIER: compile_dual_rule,
+    ButtonBehavior.DUAL: compile_dual_rule,
+    ButtonBehavior.VIRTUAL: compile_dual_rule,
+    ButtonBehavior.SIMULTANEOUS: compile_click_rule,
+}
+
+
+def _build_rule(
+    compiler: Callable[[ButtonConfig, int, int], Dict[str, Any]],
+    config: ButtonConfig,
+    vid: int = 0,
+    pid: int = 0,
+    conditions: Sequence[Dict[str, Any]] = ()
+) -> Dict[str, Any]:
     """
-    Compiles a rule turning a standard key into a virtual modifier variable.
+    Runs a behavior compiler and appends the caller's extra conditions.
 
     Args:
+        compiler: The compiler for config's behavior, from _DISPATCH.
         config: The ButtonConfig object.
         vid: The Vendor ID.
         pid: The Product ID.
+        conditions: Extra conditions placed after the device condition and
+            the config's own conditions.
 
     Returns:
         The complete manipulator dictionary.
     """
-    rule = _create_base_manipulator(config, vid, pid)
+    rule = compiler(config, vid, pid)
+    if conditions:
+        rule["conditions"].extend(conditions)
+    return rule
 
-    if not config.layer_variable:
-        raise ValueError(f"Button {config.button_id} configured as virtual modifier but missing layer_variable.")
 
-    rule["to"] = [{"set_variable": {"name": config.layer_variable, "value": 1}}]
-    rule["to_after_key_up"] = [{"set_variable": {"name": config.layer_variable, "value": 0}}]
+def compile_rule(
+    config: ButtonConfig,
+    vid: int = 0,
+    pid: int = 0,
+    conditions: Sequence[Dict[str, Any]] = ()
+) -> Dict[str, Any]:
+    """
+    Main dispatch function to compile a ButtonConfig into a Karabiner manipulator.
 
-    if config.tap_action:
-        rule["to_if_alone"] = _action_to_json(config.tap_action)
+    Every call builds a new manipulator, nested blocks included, so the
+    caller owns the result and may extend or patch any part of it.
 
-    rule["parameters"] = {
-        "basic.to_if_alone_timeout_milliseconds": config.threshold_ms
-    }
-    return rule
+    Args:
+        config: The ButtonConfig object.
+        vid: The Vendor ID.
+        pid: The Product ID.
+        conditions: Extra conditions (e.g. from make_layer_condition and
+            make_app_condition) placed after the device condition and any
+            layer_condition/app_restriction from the config, so the rule is
+            returned complete instead of being extended afterwards.
+
+    Returns:
+        The complete manipulator dictionary.
+    """
+    return _build_rule(_DISPATCH[config.behavior], config, vid, pid, conditions)
 
 
-def compile_rule(config: ButtonConfig, vid: int = 0, pid: int = 0) -> Dict[str, Any]:
+@lru_cache(maxsize=1024)
+def compile_rule_json(config: ButtonConfig, vid: int = 0, pid: int = 0) -> str:
     """
-    Main dispatch function to compile a ButtonConfig into a Karabiner manipulator.
+    Compiles a ButtonConfig straight to its compact JSON manipulator text.
+
+    The serialized text is memoized per (config, vid, pid). Strings are
+    immutable, so repeated calls can share it safely and skip both
+    compilation and encoding.
+    Fragments can be joined with "," to emit a manipulators array directly.
 
     Args:
         config: The ButtonConfig object.
@@ -354,14 +762,76 @@ def compile_rule(config: ButtonConfig, vid: int = 0, pid: int = 0) -> Dict[str,
         pid: The Product ID.
 
     Returns:
-        The complete manipulator dictionary.
+        The manipulator encoded as a JSON string.
+    """
+    return json.dumps(compile_rule(config, vid, pid), separators=(",", ":"))
+
+
+def compile_rules(configs: List[ButtonConfig], vid: int = 0, pid: int = 0) -> List[Dict[str, Any]]:
+    """
+    Compiles a batch of ButtonConfigs for a single device.
+
+    Each rule is built fresh, exactly as compile_rule does.
+
+    Args:
+        configs: The ButtonConfig objects to compile, in rule order.
+        vid: The Vendor ID.
+        pid: The Product ID.
+
+    Returns:
+        A list of manipulator dictionaries, one per config.
+    """
+    return [compile_rule(config, vid, pid) for config in configs]
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Converts a JSON-ready structure into an equivalent hashable key.
+
+    Dicts become frozensets of items, so key order is ignored as in JSON
+    objects; lists and tuples become tuples. Booleans are tagged because
+    True == 1 in Python but not in JSON.
+
+    Args:
+        value: A manipulator fragment.
+
+    Returns:
+        A hashable value equal for equal JSON fragments.
+    """
+    if isinstance(value, dict):
+        return frozenset([(key, _freeze(item)) for key, item in value.items()])
+    if isinstance(value, (list, tuple)):
+        return tuple([_freeze(item) for item in value])
+    return (bool, value) if type(value) is bool else value
+
+
+def dedupe_manipulators(manipulators: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Removes manipulators that Karabiner can never reach.
+
+    Karabiner applies the first manipulator whose 'from' block and conditions
+    match. A rule is therefore dead when an earlier rule of the same 'type'
+    has an identical 'from' block and a subset of its conditions; exact
+    duplicates are the simplest case. Surviving rules keep their order and
+    identity.
+
+    This is a check for hand-assembled rule lists; a profile known to be
+    free of shadowed rules gains nothing from running it.
+
+    Args:
+        manipulators: Manipulator dictionaries in evaluation order.
+
+    Returns:
+        A new list without the unreachable manipulators.
     """
-    if config.behavior == ButtonBehavior.CLICK:
-        return compile_click_rule(config, vid, pid)
-    elif config.behavior in [ButtonBehavior.MODIFIER, ButtonBehavior.DUAL]:
-        return compile_dual_rule(config, vid, pid)
-    elif config.behavior == ButtonBehavior.VIRTUAL:
-        return compile_virtual_modifier_rule(config, vid, pid)
-    elif config.behavior == ButtonBehavior.SIMULTANEOUS:
-        return compile_click_rule(config, vid, pid)
-    return {}
+    kept = []
+    earlier: Dict[Any, List[frozenset]] = {}
+    for manipulator in manipulators:
+        key = (manipulator.get("type"), _freeze(manipulator.get("from")))
+        shadows = earlier.setdefault(key, [])
+        conditions = frozenset([_freeze(c) for c in manipulator.get("conditions", ())])
+        if any(prior <= conditions for prior in shadows):
+            continue
+        shadows.append(conditions)
+        kept.append(manipulator)
+    return kept
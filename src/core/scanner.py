@@ -1,26 +1,232 @@
+import ctypes
 import subprocess
 import plistlib
+import signal
 import sys
-from typing import List, Dict, Any, Union
+import time
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Union
 
-def get_usb_registry() -> Union[Dict[str, Any], List[Any]]:
+_IOKIT_PATH = "/System/Library/Frameworks/IOKit.framework/IOKit"
+_CF_PATH = "/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation"
+
+_CF_STRING_ENCODING_UTF8 = 0x08000100
+_CF_NUMBER_SINT64_TYPE = 4
+
+# Registry classes for USB devices: the modern host stack, then the legacy one.
+_USB_DEVICE_CLASSES = (b"IOUSBHostDevice", b"IOUSBDevice")
+
+# Node properties copied out of IOKit, named as ioreg reports them.
+_DEVICE_PROPERTIES = ("idVendor", "idProduct", "locationID", "USB Product Name", "kUSBProductString")
+
+# Window during which scan_devices reuses its last result.
+_SCAN_TTL_SECONDS = 2.0
+_scan_cache: Dict[str, Any] = {"timestamp": 0.0, "devices": None}
+
+@lru_cache(maxsize=None)
+def _load_iokit() -> Optional[Tuple[ctypes.CDLL, ctypes.CDLL]]:
+    """
+    Loads IOKit and CoreFoundation through ctypes and declares the calls used.
+
+    Returns:
+        An (iokit, corefoundation) pair, or None when not on macOS or the
+        frameworks or their symbols cannot be loaded.
+    """
+    if sys.platform != "darwin":
+        return None
+    try:
+        iokit = ctypes.CDLL(_IOKIT_PATH)
+        cf = ctypes.CDLL(_CF_PATH)
+
+        c_void_p, c_uint32 = ctypes.c_void_p, ctypes.c_uint32
+
+        iokit.IOServiceMatching.restype = c_void_p
+        iokit.IOServiceMatching.argtypes = [ctypes.c_char_p]
+        iokit.IOServiceGetMatchingServices.restype = ctypes.c_int
+        iokit.IOServiceGetMatchingServices.argtypes = [c_uint32, c_void_p, ctypes.POINTER(c_uint32)]
+        iokit.IOIteratorNext.restype = c_uint32
+        iokit.IOIteratorNext.argtypes = [c_uint32]
+        iokit.IORegistryEntryCreateCFProperties.restype = ctypes.c_int
+        iokit.IORegistryEntryCreateCFProperties.argtypes = [c_uint32, ctypes.POINTER(c_void_p), c_void_p, c_uint32]
+        iokit.IOObjectRelease.restype = ctypes.c_int
+        iokit.IOObjectRelease.argtypes = [c_uint32]
+
+        cf.CFStringCreateWithCString.restype = c_void_p
+        cf.CFStringCreateWithCString.argtypes = [c_void_p, ctypes.c_char_p, c_uint32]
+        cf.CFDictionaryGetValue.restype = c_void_p
+        cf.CFDictionaryGetValue.argtypes = [c_void_p, c_void_p]
+        cf.CFGetTypeID.restype = ctypes.c_ulong
+        cf.CFGetTypeID.argtypes = [c_void_p]
+        cf.CFNumberGetTypeID.restype = ctypes.c_ulong
+        cf.CFNumberGetTypeID.argtypes = []
+        cf.CFStringGetTypeID.restype = ctypes.c_ulong
+        cf.CFStringGetTypeID.argtypes = []
+        cf.CFNumberGetValue.restype = ctypes.c_bool
+        cf.CFNumberGetValue.argtypes = [c_void_p, ctypes.c_long, c_void_p]
+        cf.CFStringGetCString.restype = ctypes.c_bool
+        cf.CFStringGetCString.argtypes = [c_void_p, ctypes.c_char_p, ctypes.c_long, c_uint32]
+        cf.CFRelease.restype = None
+        cf.CFRelease.argtypes = [c_void_p]
+    except (OSError, AttributeError):
+        # Missing frameworks or symbols: report IOKit as unavailable.
+        return None
+
+    return iokit, cf
+
+def _cf_to_python(cf: ctypes.CDLL, ref: int) -> Any:
+    """
+    Converts a CFNumber or CFString reference into a Python int or str.
+
+    Args:
+        cf: The loaded CoreFoundation library.
+        ref: The CFTypeRef to convert.
+
+    Returns:
+        The converted value, or None for other CF types and for values that
+        do not convert (e.g. strings longer than the 511-byte buffer).
+    """
+    type_id = cf.CFGetTypeID(ref)
+    if type_id == cf.CFNumberGetTypeID():
+        value = ctypes.c_int64()
+        if cf.CFNumberGetValue(ref, _CF_NUMBER_SINT64_TYPE, ctypes.byref(value)):
+            return value.value
+    elif type_id == cf.CFStringGetTypeID():
+        buffer = ctypes.create_string_buffer(512)
+        if cf.CFStringGetCString(ref, buffer, len(buffer), _CF_STRING_ENCODING_UTF8):
+            return buffer.value.decode("utf-8")
+    return None
+
+def _read_iokit_devices() -> Optional[List[Dict[str, Any]]]:
+    """
+    Reads USB device nodes in-process through the IOKit C API.
+
+    Avoids spawning ioreg and round-tripping the whole registry through a
+    plist. Devices are returned as flat nodes carrying the same property
+    names ioreg uses, so traverse_registry handles them unchanged.
+
+    Returns:
+        A list of device nodes, or None when IOKit is unavailable or the
+        registry query fails.
     """
-    Retrieves the full USB plane from the macOS I/O Registry as a parsed dictionary.
+    libs = _load_iokit()
+    if libs is None:
+        return None
+    iokit, cf = libs
+
+    keys = {
+        name: cf.CFStringCreateWithCString(None, name.encode(), _CF_STRING_ENCODING_UTF8)
+        for name in _DEVICE_PROPERTIES
+    }
+    try:
+        for class_name in _USB_DEVICE_CLASSES:
+            iterator = ctypes.c_uint32()
+            # The matching dictionary is consumed by IOServiceGetMatchingServices.
+            matching = iokit.IOServiceMatching(class_name)
+            if iokit.IOServiceGetMatchingServices(0, matching, ctypes.byref(iterator)) != 0:
+                return None
+
+            nodes = []
+            try:
+                service = iokit.IOIteratorNext(iterator)
+                while service:
+                    props = ctypes.c_void_p()
+                    if iokit.IORegistryEntryCreateCFProperties(service, ctypes.byref(props), None, 0) == 0:
+                        node = {}
+                        for name, key in keys.items():
+                            ref = cf.CFDictionaryGetValue(props, key)
+                            if ref:
+                                value = _cf_to_python(cf, ref)
+                                # Leave unconvertible values (other CF types, strings
+                                # over the buffer) unset, as if ioreg had not listed them,
+                                # so the name fallbacks still apply.
+                                if value is not None:
+                                    node[name] = value
+                        cf.CFRelease(props)
+                        nodes.append(node)
+                    iokit.IOObjectRelease(service)
+                    service = iokit.IOIteratorNext(iterator)
+            finally:
+                iokit.IOObjectRelease(iterator)
+
+            if nodes:
+                return nodes
+        return []
+    finally:
+        for key in keys.values():
+            if key:
+                cf.CFRelease(key)
+
+def _read_ioreg_archive() -> Union[Dict[str, Any], List[Any]]:
+    """
+    Retrieves the USB plane by running ioreg and parsing its plist archive.
 
     Returns:
         A dictionary (or list of dictionaries) representing the root of the IOUSB plane.
 
     Raises:
-        subprocess.CalledProcessError: If the ioreg command fails.
-        plistlib.InvalidFileException: If the output cannot be parsed as XML.
+        subprocess.CalledProcessError: If the ioreg or plutil command fails;
+            plutil's failure takes precedence and carries its stderr.
+        plistlib.InvalidFileException: If the output cannot be parsed as a plist.
     """
     # -a: Archive (XML output)
     # -p IOUSB: Restrict to USB plane
     # -l: Load all properties (includes IDs)
     cmd = ["ioreg", "-p", "IOUSB", "-a", "-l"]
 
-    output = subprocess.check_output(cmd)
-    return plistlib.loads(output)
+    # Re-encode as a binary plist: plutil converts in native code, and
+    # plistlib parses the compact binary form much faster than XML.
+    convert = ["plutil", "-convert", "binary1", "-o", "-", "-"]
+
+    # Pipe ioreg straight into plutil so the XML streams between the two
+    # processes and is never buffered here; only the binary result is.
+    ioreg = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    try:
+        converted = subprocess.run(convert, stdin=ioreg.stdout, capture_output=True)
+    finally:
+        ioreg.stdout.close()
+        returncode = ioreg.wait()
+
+    # plutil is checked first: when it exits early, ioreg dies of SIGPIPE and
+    # its status says nothing, while plutil's stderr names the problem. An
+    # ioreg failure that truncated plutil's input is kept as the cause.
+    ioreg_error = None
+    if returncode != 0 and returncode != -signal.SIGPIPE:
+        ioreg_error = subprocess.CalledProcessError(returncode, cmd)
+    if converted.returncode != 0:
+        raise subprocess.CalledProcessError(
+            converted.returncode, convert, stderr=converted.stderr
+        ) from ioreg_error
+    if ioreg_error is not None:
+        raise ioreg_error
+    # The format is known, so skip plistlib's header sniffing.
+    return plistlib.loads(converted.stdout, fmt=plistlib.FMT_BINARY)
+
+def get_usb_registry() -> Union[Dict[str, Any], List[Any]]:
+    """
+    Retrieves the USB devices from the macOS I/O Registry as parsed dictionaries.
+
+    Queries IOKit in-process when available, falling back to the ioreg
+    subprocess when the frameworks cannot be loaded, the query raises, or
+    it returns no devices.
+
+    Returns:
+        From IOKit, a flat list of device nodes without children. From ioreg,
+        a dictionary (or list of dictionaries) representing the root of the
+        IOUSB plane. traverse_registry accepts either shape.
+
+    Raises:
+        subprocess.CalledProcessError: If the ioreg or plutil command fails.
+        plistlib.InvalidFileException: If the output cannot be parsed as a plist.
+    """
+    try:
+        devices = _read_iokit_devices()
+    except Exception:
+        # A ctypes call that does not match this system's frameworks must not
+        # hide the devices ioreg can still report.
+        devices = None
+    if devices:
+        return devices
+    return _read_ioreg_archive()
 
 def _extract_device_data(node: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -47,34 +253,49 @@ def _extract_device_data(node: Dict[str, Any]) -> Dict[str, Any]:
 
 def traverse_registry(node: Dict[str, Any], device_list: List[Dict[str, Any]]) -> None:
     """
-    Recursively traverses the IORegistry tree to identify valid USB devices.
+    Traverses the IORegistry tree depth-first to identify valid USB devices.
 
-    Populates device_list with devices that possess valid Vendor and Product IDs.
+    Populates device_list with devices that possess valid (integer) Vendor
+    and Product IDs.
 
     Args:
         node: Current node in the registry tree.
         device_list: Accumulator list for found devices.
     """
-    # Filter for nodes that act as devices (must have VID/PID)
-    if "idVendor" in node and "idProduct" in node:
-        device_data = _extract_device_data(node)
-        device_list.append(device_data)
+    # Explicit stack instead of recursion: no frame per node and no depth limit
+    # on long hub/dock chains. Nodes are visited in the same pre-order.
+    stack = [node]
+    while stack:
+        current = stack.pop()
 
-    # Recurse into children (Hubs/Docks)
-    # Key 'IORegistryEntryChildren' contains the list of child nodes
-    children = node.get("IORegistryEntryChildren", [])
-    for child in children:
-        traverse_registry(child, device_list)
+        # Filter for nodes that act as devices (must have integer VID/PID)
+        if isinstance(current.get("idVendor"), int) and isinstance(current.get("idProduct"), int):
+            device_list.append(_extract_device_data(current))
 
-def scan_devices() -> List[Dict[str, Any]]:
+        # Queue children (Hubs/Docks), reversed so the first child pops first
+        # Key 'IORegistryEntryChildren' contains the list of child nodes
+        stack.extend(reversed(current.get("IORegistryEntryChildren", ())))
+
+def scan_devices(force: bool = False) -> List[Dict[str, Any]]:
     """
     Main entry point for USB discovery.
 
-    Orchestrates the retrieval and traversal of the registry.
+    Orchestrates the retrieval and traversal of the registry. Successful scans
+    are reused for _SCAN_TTL_SECONDS so bursts of calls (e.g. during
+    interactive configuration) query the registry only once.
+
+    Args:
+        force: Bypass the cached result and rescan the registry.
 
     Returns:
         A list of dictionaries, each representing a connected USB device.
+        The list and its dictionaries are copies the caller may modify.
     """
+    now = time.monotonic()
+    cached = _scan_cache["devices"]
+    if not force and cached is not None and now - _scan_cache["timestamp"] < _SCAN_TTL_SECONDS:
+        return [dict(d) for d in cached]
+
     try:
         registry_root = get_usb_registry()
     except Exception as e:
@@ -90,20 +311,25 @@ def scan_devices() -> List[Dict[str, Any]]:
     elif isinstance(registry_root, dict):
         traverse_registry(registry_root, found_devices)
 
-    return found_devices
+    _scan_cache["devices"] = found_devices
+    _scan_cache["timestamp"] = now
+    return [dict(d) for d in found_devices]
 
 def print_report(devices: List[Dict[str, Any]]) -> None:
     """
     Formats and prints the device list to stdout in a tabular format.
+
+    The report is assembled first and emitted with a single write.
     """
-    print(f"\n{'VENDOR ID':<12} | {'PRODUCT ID':<12} | {'DEVICE NAME'}")
-    print("-" * 65)
+    lines = ["", f"{'VENDOR ID':<12} | {'PRODUCT ID':<12} | {'DEVICE NAME'}", "-" * 65]
 
     for dev in devices:
         v_dec, p_dec = dev['vendor_id'], dev['product_id']
         v_hex, p_hex = f"0x{v_dec:04x}", f"0x{p_dec:04x}"
 
-        print(f"{v_hex} ({v_dec:<4}) | {p_hex} ({p_dec:<4}) | {dev['name']}")
+        lines.append(f"{v_hex} ({v_dec:<4}) | {p_hex} ({p_dec:<4}) | {dev['name']}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     devices = scan_devices()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Make the repository root importable, so tests can import from src, and
+# src/core for the scanner, which runs as a standalone script from there.
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, _ROOT)
+sys.path.insert(1, os.path.join(_ROOT, "src", "core"))
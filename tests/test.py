@@ -1,504 +0,0 @@
-import sys
-import os
-import json
-
-# Adjust path to import from src
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from src.core import (
-    compile_rule,
-    add_app_restriction,
-    add_layer_condition,
-    make_seq,
-    ButtonConfig,
-    ButtonBehavior,
-    Action,
-    ActionEvent
-)
-
-# ==============================================================================
-# CONFIGURATION
-# ==============================================================================
-
-VID = 1678
-PID = 181
-
-LAYER_HYPER = "naga_hyper_wheel"
-LAYER_RMB   = "naga_hyper_rmb"
-
-APP_CHROME   = r"^com\.google\.Chrome$"
-APP_NOTES    = r"^com\.apple\.Notes$"
-APP_SUBLIME  = r"^com\.sublimetext\.4$"
-APP_EMACS    = r"^org\.gnu\.Emacs$"
-APP_OBSIDIAN = r"^md\.obsidian$"
-
-def generate_leisure_profile():
-    """
-    Generates the MouseMapper V4.2 'Leisure Audit' Profile.
-    """
-    manipulators = []
-
-    # ==========================================================================
-    # 1. LAYER DEFINITIONS
-    # ==========================================================================
-
-    # Global Hyper: Scroll Wheel (Button 3)
-    manipulators.append(compile_rule(
-        ButtonConfig("button3", ButtonBehavior.DUAL, tap_action=Action("button3"), layer_variable=LAYER_HYPER, threshold_ms=200),
-        VID, PID
-    ))
-
-    # Context Layer: Right Click (Button 2)
-    r_rmb = compile_rule(
-        ButtonConfig("button2", ButtonBehavior.DUAL, tap_action=Action("button2"), layer_variable=LAYER_RMB, threshold_ms=150),
-        VID, PID
-    )
-    r_rmb["conditions"] = [{
-        "type": "frontmost_application_if",
-        "bundle_identifiers": [APP_CHROME, APP_NOTES, APP_SUBLIME, APP_EMACS, APP_OBSIDIAN]
-    }]
-    manipulators.append(r_rmb)
-
-
-    # ==========================================================================
-    # 2. ROW 1: NAVIGATION & FILES
-    # ==========================================================================
-
-    # --- Button 1: Left / Back ---
-
-    r_b1_hyp = compile_rule(ButtonConfig("1", ButtonBehavior.CLICK, Action("1", ["left_option", "left_shift"])), VID, PID)
-    add_layer_condition(r_b1_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b1_hyp)
-
-    r_b1_emacs = compile_rule(ButtonConfig("1", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("spacebar"), ActionEvent("f"), ActionEvent("r")
-    ])), VID, PID)
-    add_layer_condition(r_b1_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b1_emacs, APP_EMACS)
-    manipulators.append(r_b1_emacs)
-
-    # Obsidian: Navigate Back
-    r_b1_obs = compile_rule(ButtonConfig("1", ButtonBehavior.CLICK, Action("open_bracket", ["left_command"])), VID, PID)
-    add_layer_condition(r_b1_obs, LAYER_RMB, 1)
-    add_app_restriction(r_b1_obs, APP_OBSIDIAN)
-    manipulators.append(r_b1_obs)
-
-    # General: Tab Left
-    r_b1_rmb = compile_rule(ButtonConfig("1", ButtonBehavior.CLICK, Action("open_bracket", ["left_command", "left_shift"])), VID, PID)
-    add_layer_condition(r_b1_rmb, LAYER_RMB, 1)
-    add_app_restriction(r_b1_rmb, r"^(com\.google\.Chrome|com\.apple\.Notes|com\.sublimetext\.4)$")
-    manipulators.append(r_b1_rmb)
-
-    manipulators.append(compile_rule(ButtonConfig("1", ButtonBehavior.CLICK, Action("left_arrow", ["left_control"])), VID, PID))
-
-
-    # --- Button 2: Center / Overview ---
-
-    r_b2_hyp = compile_rule(ButtonConfig("2", ButtonBehavior.CLICK, Action("2", ["left_option", "left_shift"])), VID, PID)
-    add_layer_condition(r_b2_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b2_hyp)
-
-    r_b2_emacs = compile_rule(ButtonConfig("2", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("spacebar"), ActionEvent("f"), ActionEvent("d")
-    ])), VID, PID)
-    add_layer_condition(r_b2_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b2_emacs, APP_EMACS)
-    manipulators.append(r_b2_emacs)
-
-    # Obsidian: Toggle Read/Edit Mode
-    r_b2_obs = compile_rule(ButtonConfig("2", ButtonBehavior.CLICK, Action("e", ["left_command"])), VID, PID)
-    add_layer_condition(r_b2_obs, LAYER_RMB, 1)
-    add_app_restriction(r_b2_obs, APP_OBSIDIAN)
-    manipulators.append(r_b2_obs)
-
-    r_b2_chrome = compile_rule(ButtonConfig("2", ButtonBehavior.CLICK, Action("t", ["left_command", "left_shift"])), VID, PID)
-    add_layer_condition(r_b2_chrome, LAYER_RMB, 1)
-    add_app_restriction(r_b2_chrome, APP_CHROME)
-    manipulators.append(r_b2_chrome)
-
-    r_b2_subl = compile_rule(ButtonConfig("2", ButtonBehavior.CLICK, Action("s", ["left_command"])), VID, PID)
-    add_layer_condition(r_b2_subl, LAYER_RMB, 1)
-    add_app_restriction(r_b2_subl, APP_SUBLIME)
-    manipulators.append(r_b2_subl)
-
-    r_b2_notes = compile_rule(ButtonConfig("2", ButtonBehavior.CLICK, Action("s", ["left_command", "left_option"])), VID, PID)
-    add_layer_condition(r_b2_notes, LAYER_RMB, 1)
-    add_app_restriction(r_b2_notes, APP_NOTES)
-    manipulators.append(r_b2_notes)
-
-    manipulators.append(compile_rule(ButtonConfig("2", ButtonBehavior.CLICK, Action("up_arrow", ["left_control"])), VID, PID))
-
-
-    # --- Button 3: Right / Forward ---
-
-    r_b3_hyp = compile_rule(ButtonConfig("3", ButtonBehavior.CLICK, Action("return_or_enter", ["left_control", "left_option", "left_shift"])), VID, PID)
-    add_layer_condition(r_b3_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b3_hyp)
-
-    r_b3_emacs = compile_rule(ButtonConfig("3", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("spacebar"), ActionEvent("f"), ActionEvent("f")
-    ])), VID, PID)
-    add_layer_condition(r_b3_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b3_emacs, APP_EMACS)
-    manipulators.append(r_b3_emacs)
-
-    # Obsidian: Navigate Forward
-    r_b3_obs = compile_rule(ButtonConfig("3", ButtonBehavior.CLICK, Action("close_bracket", ["left_command"])), VID, PID)
-    add_layer_condition(r_b3_obs, LAYER_RMB, 1)
-    add_app_restriction(r_b3_obs, APP_OBSIDIAN)
-    manipulators.append(r_b3_obs)
-
-    r_b3_rmb = compile_rule(ButtonConfig("3", ButtonBehavior.CLICK, Action("close_bracket", ["left_command", "left_shift"])), VID, PID)
-    add_layer_condition(r_b3_rmb, LAYER_RMB, 1)
-    add_app_restriction(r_b3_rmb, r"^(com\.google\.Chrome|com\.apple\.Notes|com\.sublimetext\.4)$")
-    manipulators.append(r_b3_rmb)
-
-    manipulators.append(compile_rule(ButtonConfig("3", ButtonBehavior.CLICK, Action("right_arrow", ["left_control"])), VID, PID))
-
-
-    # ==========================================================================
-    # 3. ROW 2: ACTION & EDITING
-    # ==========================================================================
-
-    # --- Button 4: Copy / Pull / Seek Back ---
-
-    r_b4_hyp = compile_rule(ButtonConfig("4", ButtonBehavior.CLICK, Action("x", ["left_command"])), VID, PID)
-    add_layer_condition(r_b4_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b4_hyp)
-
-    # Chrome: Seek Backward
-    r_b4_chrome = compile_rule(ButtonConfig("4", ButtonBehavior.CLICK, Action("left_arrow")), VID, PID)
-    add_layer_condition(r_b4_chrome, LAYER_RMB, 1)
-    add_app_restriction(r_b4_chrome, APP_CHROME)
-    manipulators.append(r_b4_chrome)
-
-    # Obsidian: Toggle Checkbox
-    r_b4_obs = compile_rule(ButtonConfig("4", ButtonBehavior.CLICK, Action("l", ["left_command"])), VID, PID)
-    add_layer_condition(r_b4_obs, LAYER_RMB, 1)
-    add_app_restriction(r_b4_obs, APP_OBSIDIAN)
-    manipulators.append(r_b4_obs)
-
-    r_b4_emacs = compile_rule(ButtonConfig("4", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("f", ["left_shift"]),
-        ActionEvent("p")
-    ])), VID, PID)
-    add_layer_condition(r_b4_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b4_emacs, APP_EMACS)
-    manipulators.append(r_b4_emacs)
-
-    r_b4_subl = compile_rule(ButtonConfig("4", ButtonBehavior.CLICK, Action("d", ["left_command", "left_shift"])), VID, PID)
-    add_layer_condition(r_b4_subl, LAYER_RMB, 1)
-    add_app_restriction(r_b4_subl, APP_SUBLIME)
-    manipulators.append(r_b4_subl)
-
-    r_b4_notes = compile_rule(ButtonConfig("4", ButtonBehavior.CLICK, Action("l", ["left_command", "left_shift"])), VID, PID)
-    add_layer_condition(r_b4_notes, LAYER_RMB, 1)
-    add_app_restriction(r_b4_notes, APP_NOTES)
-    manipulators.append(r_b4_notes)
-
-    manipulators.append(compile_rule(ButtonConfig("4", ButtonBehavior.CLICK, Action("c", ["left_command"])), VID, PID))
-
-
-    # --- Button 5: Undo / Cycle ---
-
-    r_b5_hyp = compile_rule(ButtonConfig("5", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("left_arrow", ["left_command", "left_shift"]),
-        ActionEvent("right_arrow", ["left_command", "left_shift"])
-    ])), VID, PID)
-    add_layer_condition(r_b5_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b5_hyp)
-
-    r_b5_emacs = compile_rule(ButtonConfig("5", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("spacebar"), ActionEvent("w"), ActionEvent("w")
-    ])), VID, PID)
-    add_layer_condition(r_b5_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b5_emacs, APP_EMACS)
-    manipulators.append(r_b5_emacs)
-
-    r_b5_rmb = compile_rule(ButtonConfig("5", ButtonBehavior.CLICK, Action("escape")), VID, PID)
-    add_layer_condition(r_b5_rmb, LAYER_RMB, 1)
-    add_app_restriction(r_b5_rmb, r"^(com\.google\.Chrome|com\.apple\.Notes|com\.sublimetext\.4|md\.obsidian)$")
-    manipulators.append(r_b5_rmb)
-
-    manipulators.append(compile_rule(ButtonConfig("5", ButtonBehavior.CLICK, Action("z", ["left_command"])), VID, PID))
-
-
-    # --- Button 6: Paste / Commit / Seek Fwd ---
-
-    r_b6_hyp = compile_rule(ButtonConfig("6", ButtonBehavior.CLICK, Action("v", ["left_option", "left_shift", "left_command"])), VID, PID)
-    add_layer_condition(r_b6_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b6_hyp)
-
-    # Chrome: Seek Forward
-    r_b6_chrome = compile_rule(ButtonConfig("6", ButtonBehavior.CLICK, Action("right_arrow")), VID, PID)
-    add_layer_condition(r_b6_chrome, LAYER_RMB, 1)
-    add_app_restriction(r_b6_chrome, APP_CHROME)
-    manipulators.append(r_b6_chrome)
-
-    # Obsidian: Select All
-    r_b6_obs = compile_rule(ButtonConfig("6", ButtonBehavior.CLICK, Action("a", ["left_command"])), VID, PID)
-    add_layer_condition(r_b6_obs, LAYER_RMB, 1)
-    add_app_restriction(r_b6_obs, APP_OBSIDIAN)
-    manipulators.append(r_b6_obs)
-
-    r_b6_emacs = compile_rule(ButtonConfig("6", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("c"), ActionEvent("c")
-    ])), VID, PID)
-    add_layer_condition(r_b6_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b6_emacs, APP_EMACS)
-    manipulators.append(r_b6_emacs)
-
-    # Notes: Indent
-    r_b6_notes = compile_rule(ButtonConfig("6", ButtonBehavior.CLICK, Action("close_bracket", ["left_command"])), VID, PID)
-    add_layer_condition(r_b6_notes, LAYER_RMB, 1)
-    add_app_restriction(r_b6_notes, APP_NOTES)
-    manipulators.append(r_b6_notes)
-
-    # Sublime: Paste
-    r_b6_subl = compile_rule(ButtonConfig("6", ButtonBehavior.CLICK, Action("v", ["left_command", "left_shift"])), VID, PID)
-    add_layer_condition(r_b6_subl, LAYER_RMB, 1)
-    add_app_restriction(r_b6_subl, APP_SUBLIME)
-    manipulators.append(r_b6_subl)
-
-    manipulators.append(compile_rule(ButtonConfig("6", ButtonBehavior.CLICK, Action("v", ["left_command"])), VID, PID))
-
-
-    # ==========================================================================
-    # 4. ROW 3: LIFECYCLE
-    # ==========================================================================
-
-    # --- Button 7: Start / New ---
-
-    # Hyper (Wheel): Play/Pause
-    r_b7_hyp = compile_rule(ButtonConfig("7", ButtonBehavior.CLICK, Action("play_or_pause")), VID, PID)
-    add_layer_condition(r_b7_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b7_hyp)
-
-    r_b7_emacs = compile_rule(ButtonConfig("7", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("spacebar"), ActionEvent("q"), ActionEvent("r")
-    ])), VID, PID)
-    add_layer_condition(r_b7_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b7_emacs, APP_EMACS)
-    manipulators.append(r_b7_emacs)
-
-    # Chrome RMB: New Tab (Cmd+T)
-    r_b7_chrome = compile_rule(ButtonConfig("7", ButtonBehavior.CLICK, Action("t", ["left_command"])), VID, PID)
-    add_layer_condition(r_b7_chrome, LAYER_RMB, 1)
-    add_app_restriction(r_b7_chrome, APP_CHROME)
-    manipulators.append(r_b7_chrome)
-
-    # Obsidian RMB: Daily Note (Cmd+Shift+D)
-    r_b7_obs = compile_rule(ButtonConfig("7", ButtonBehavior.CLICK, Action("d", ["left_command", "left_shift"])), VID, PID)
-    add_layer_condition(r_b7_obs, LAYER_RMB, 1)
-    add_app_restriction(r_b7_obs, APP_OBSIDIAN)
-    manipulators.append(r_b7_obs)
-
-    # Notes RMB: Pin Note (Cmd+N as placeholder or custom)
-    r_b7_notes = compile_rule(ButtonConfig("7", ButtonBehavior.CLICK, Action("n", ["left_command"])), VID, PID)
-    add_layer_condition(r_b7_notes, LAYER_RMB, 1)
-    add_app_restriction(r_b7_notes, APP_NOTES)
-    manipulators.append(r_b7_notes)
-
-    # Global Tap: New Window (Cmd+N)
-    manipulators.append(compile_rule(ButtonConfig("7", ButtonBehavior.CLICK, Action("n", ["left_command"])), VID, PID))
-
-
-    # --- Button 8: Enter / Status ---
-
-    r_b8_hyp = compile_rule(ButtonConfig("8", ButtonBehavior.CLICK, Action("r", ["left_command"])), VID, PID)
-    add_layer_condition(r_b8_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b8_hyp)
-
-    r_b8_emacs = compile_rule(ButtonConfig("8", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("spacebar"), ActionEvent("g"), ActionEvent("g")
-    ])), VID, PID)
-    add_layer_condition(r_b8_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b8_emacs, APP_EMACS)
-    manipulators.append(r_b8_emacs)
-
-    r_b8_chrome = compile_rule(ButtonConfig("8", ButtonBehavior.CLICK, Action("r", ["left_command", "left_shift"])), VID, PID)
-    add_layer_condition(r_b8_chrome, LAYER_RMB, 1)
-    add_app_restriction(r_b8_chrome, APP_CHROME)
-    manipulators.append(r_b8_chrome)
-
-    # Obsidian: Command Palette
-    r_b8_obs = compile_rule(ButtonConfig("8", ButtonBehavior.CLICK, Action("p", ["left_command"])), VID, PID)
-    add_layer_condition(r_b8_obs, LAYER_RMB, 1)
-    add_app_restriction(r_b8_obs, APP_OBSIDIAN)
-    manipulators.append(r_b8_obs)
-
-    r_b8_subl = compile_rule(ButtonConfig("8", ButtonBehavior.CLICK, Action("p", ["left_command", "left_shift"])), VID, PID)
-    add_layer_condition(r_b8_subl, LAYER_RMB, 1)
-    add_app_restriction(r_b8_subl, APP_SUBLIME)
-    manipulators.append(r_b8_subl)
-
-    r_b8_notes = compile_rule(ButtonConfig("8", ButtonBehavior.CLICK, Action("3", ["left_command"])), VID, PID)
-    add_layer_condition(r_b8_notes, LAYER_RMB, 1)
-    add_app_restriction(r_b8_notes, APP_NOTES)
-    manipulators.append(r_b8_notes)
-
-    manipulators.append(compile_rule(ButtonConfig("8", ButtonBehavior.CLICK, Action("return_or_enter")), VID, PID))
-
-
-    # --- Button 9: Close / Quit ---
-
-    r_b9_hyp = compile_rule(ButtonConfig("9", ButtonBehavior.CLICK, Action("escape", ["left_command", "left_option"])), VID, PID)
-    add_layer_condition(r_b9_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b9_hyp)
-
-    r_b9_emacs = compile_rule(ButtonConfig("9", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("spacebar"), ActionEvent("q"), ActionEvent("q")
-    ])), VID, PID)
-    add_layer_condition(r_b9_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b9_emacs, APP_EMACS)
-    manipulators.append(r_b9_emacs)
-
-    r_b9_rmb = compile_rule(ButtonConfig("9", ButtonBehavior.CLICK, Action("w", ["left_command"])), VID, PID)
-    add_layer_condition(r_b9_rmb, LAYER_RMB, 1)
-    add_app_restriction(r_b9_rmb, r"^(com\.google\.Chrome|com\.apple\.Notes|com\.sublimetext\.4|md\.obsidian)$")
-    manipulators.append(r_b9_rmb)
-
-    manipulators.append(compile_rule(ButtonConfig("9", ButtonBehavior.CLICK, Action("w", ["left_command"])), VID, PID))
-
-
-    # ==========================================================================
-    # 5. ROW 4: TOOLS & REMOTE
-    # ==========================================================================
-
-    # --- Button 10: Find / Search ---
-
-    r_b10_hyp = compile_rule(ButtonConfig("0", ButtonBehavior.CLICK, Action("f", ["left_command"])), VID, PID)
-    add_layer_condition(r_b10_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b10_hyp)
-
-    r_b10_emacs = compile_rule(ButtonConfig("0", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("spacebar"), ActionEvent("slash")
-    ])), VID, PID)
-    add_layer_condition(r_b10_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b10_emacs, APP_EMACS)
-    manipulators.append(r_b10_emacs)
-
-    r_b10_chrome = compile_rule(ButtonConfig("0", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("c", ["left_command"]),
-        ActionEvent("t", ["left_command"]),
-        ActionEvent("v", ["left_command"]),
-        ActionEvent("return_or_enter")
-    ])), VID, PID)
-    add_layer_condition(r_b10_chrome, LAYER_RMB, 1)
-    add_app_restriction(r_b10_chrome, APP_CHROME)
-    manipulators.append(r_b10_chrome)
-
-    # Obsidian: Quick Switcher
-    r_b10_obs = compile_rule(ButtonConfig("0", ButtonBehavior.CLICK, Action("o", ["left_command"])), VID, PID)
-    add_layer_condition(r_b10_obs, LAYER_RMB, 1)
-    add_app_restriction(r_b10_obs, APP_OBSIDIAN)
-    manipulators.append(r_b10_obs)
-
-    r_b10_subl = compile_rule(ButtonConfig("0", ButtonBehavior.CLICK, Action("o", ["left_command"])), VID, PID)
-    add_layer_condition(r_b10_subl, LAYER_RMB, 1)
-    add_app_restriction(r_b10_subl, APP_SUBLIME)
-    manipulators.append(r_b10_subl)
-
-    r_b10_notes = compile_rule(ButtonConfig("0", ButtonBehavior.CLICK, Action("f", ["left_command", "left_option"])), VID, PID)
-    add_layer_condition(r_b10_notes, LAYER_RMB, 1)
-    add_app_restriction(r_b10_notes, APP_NOTES)
-    manipulators.append(r_b10_notes)
-
-    manipulators.append(compile_rule(ButtonConfig("0", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("c", ["left_command"]),
-        ActionEvent("f", ["left_command"]),
-        ActionEvent("v", ["left_command"]),
-        ActionEvent("return_or_enter", hold_down_milliseconds=20)
-    ])), VID, PID))
-
-
-    # --- Button 11: Vol Down / Switch ---
-
-    r_b11_hyp = compile_rule(ButtonConfig("hyphen", ButtonBehavior.CLICK, Action("display_brightness_decrement")), VID, PID)
-    add_layer_condition(r_b11_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b11_hyp)
-
-    r_b11_emacs = compile_rule(ButtonConfig("hyphen", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("spacebar"), ActionEvent("b"), ActionEvent("b")
-    ])), VID, PID)
-    add_layer_condition(r_b11_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b11_emacs, APP_EMACS)
-    manipulators.append(r_b11_emacs)
-
-    # Obsidian: Link [[
-    r_b11_obs = compile_rule(ButtonConfig("hyphen", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("open_bracket"), ActionEvent("open_bracket")
-    ])), VID, PID)
-    add_layer_condition(r_b11_obs, LAYER_RMB, 1)
-    add_app_restriction(r_b11_obs, APP_OBSIDIAN)
-    manipulators.append(r_b11_obs)
-
-    r_b11_chrome = compile_rule(ButtonConfig("hyphen", ButtonBehavior.CLICK, Action("d", ["left_command"])), VID, PID)
-    add_layer_condition(r_b11_chrome, LAYER_RMB, 1)
-    add_app_restriction(r_b11_chrome, APP_CHROME)
-    manipulators.append(r_b11_chrome)
-
-    r_b11_subl = compile_rule(ButtonConfig("hyphen", ButtonBehavior.CLICK, Action("slash", ["left_command"])), VID, PID)
-    add_layer_condition(r_b11_subl, LAYER_RMB, 1)
-    add_app_restriction(r_b11_subl, APP_SUBLIME)
-    manipulators.append(r_b11_subl)
-
-    r_b11_notes = compile_rule(ButtonConfig("hyphen", ButtonBehavior.CLICK, Action("k", ["left_command"])), VID, PID)
-    add_layer_condition(r_b11_notes, LAYER_RMB, 1)
-    add_app_restriction(r_b11_notes, APP_NOTES)
-    manipulators.append(r_b11_notes)
-
-    manipulators.append(compile_rule(ButtonConfig("hyphen", ButtonBehavior.CLICK, Action("volume_decrement")), VID, PID))
-
-
-    # --- Button 12: Vol Up / Ship It ---
-
-    r_b12_hyp = compile_rule(ButtonConfig("equal_sign", ButtonBehavior.CLICK, Action("display_brightness_increment")), VID, PID)
-    add_layer_condition(r_b12_hyp, LAYER_HYPER, 1)
-    manipulators.append(r_b12_hyp)
-
-    r_b12_chrome = compile_rule(ButtonConfig("equal_sign", ButtonBehavior.CLICK, Action("n", ["left_command", "left_shift"])), VID, PID)
-    add_layer_condition(r_b12_chrome, LAYER_RMB, 1)
-    add_app_restriction(r_b12_chrome, APP_CHROME)
-    manipulators.append(r_b12_chrome)
-
-    r_b12_emacs = compile_rule(ButtonConfig("equal_sign", ButtonBehavior.CLICK, make_seq([
-        ActionEvent("p", ["left_shift"]),
-        ActionEvent("p")
-    ])), VID, PID)
-    add_layer_condition(r_b12_emacs, LAYER_RMB, 1)
-    add_app_restriction(r_b12_emacs, APP_EMACS)
-    manipulators.append(r_b12_emacs)
-
-    # Obsidian: Fold/Unfold
-    r_b12_obs = compile_rule(ButtonConfig("equal_sign", ButtonBehavior.CLICK, Action("open_bracket", ["left_command", "left_option"])), VID, PID)
-    add_layer_condition(r_b12_obs, LAYER_RMB, 1)
-    add_app_restriction(r_b12_obs, APP_OBSIDIAN)
-    manipulators.append(r_b12_obs)
-
-    r_b12_subl = compile_rule(ButtonConfig("equal_sign", ButtonBehavior.CLICK, Action("a", ["left_command"])), VID, PID)
-    add_layer_condition(r_b12_subl, LAYER_RMB, 1)
-    add_app_restriction(r_b12_subl, APP_SUBLIME)
-    manipulators.append(r_b12_subl)
-
-    manipulators.append(compile_rule(ButtonConfig("equal_sign", ButtonBehavior.CLICK, Action("volume_increment")), VID, PID))
-
-
-    # ==========================================================================
-    # OUTPUT
-    # ==========================================================================
-    profile_json = {
-        "title": "test v4.2",
-        "rules": [
-            {
-                "description": "MouseMapper V4.2",
-                "manipulators": manipulators
-            }
-        ]
-    }
-
-    print(json.dumps(profile_json, indent=2))
-
-
-if __name__ == "__main__":
-    generate_leisure_profile()
@@ -0,0 +1,273 @@
+import sys
+import json
+import re
+from enum import Enum
+
+import pytest
+
+from src.core import (
+    compile_rule,
+    compile_rule_json,
+    dedupe_manipulators,
+    ButtonConfig,
+    ButtonBehavior,
+    Action,
+    ActionEvent,
+    _action_to_json,
+    _bundle_identifiers,
+    _serialize_action
+)
+
+# ==============================================================================
+# RULE OWNERSHIP
+# ==============================================================================
+
+def _dual_config():
+    return ButtonConfig(
+        button_id="button4",
+        behavior=ButtonBehavior.DUAL,
+        tap_action=Action("w", ["left_command"]),
+        layer_variable="ownership_layer",
+        optional_modifiers=("any",)
+    )
+
+
+def test_mutating_compiled_rule_does_not_leak():
+    config = _dual_config()
+    rule = compile_rule(config, 1, 2)
+    pristine = json.dumps(rule)
+    assert rule["from"]["modifiers"] == {"optional": ["any"]}
+    assert rule["to_if_alone"][0]["modifiers"] == ["left_command"]
+
+    rule["from"]["modifiers"]["optional"] = ["left_shift"]
+    rule["to"][0]["set_variable"]["value"] = 5
+    rule["to_after_key_up"][0]["set_variable"]["name"] = "other"
+    rule["to_if_alone"][0]["key_code"] = "ZZ"
+    rule["parameters"]["basic.to_if_alone_timeout_milliseconds"] = 1
+    rule["conditions"][0]["identifiers"][0]["vendor_id"] = 0
+
+    assert json.dumps(compile_rule(config, 1, 2)) == pristine
+    assert json.dumps(compile_rule(_dual_config(), 1, 2)) == pristine
+    expected = json.loads(pristine)
+    assert json.loads(compile_rule_json(config, 1, 2)) == expected
+    expected["conditions"][0]["identifiers"][0] = {"vendor_id": 9, "product_id": 9}
+    assert json.loads(compile_rule_json(config, 9, 9)) == expected
+
+
+def test_compiled_rules_share_no_containers():
+    config = _dual_config()
+    first = compile_rule(config, 1, 2)
+    second = compile_rule(config, 1, 2)
+    for key in ("from", "conditions", "to", "to_after_key_up", "to_if_alone", "parameters"):
+        assert first[key] == second[key]
+        assert first[key] is not second[key]
+    assert first["conditions"][0] is not second["conditions"][0]
+    assert first["from"]["modifiers"]["optional"] is not second["from"]["modifiers"]["optional"]
+    assert first["to_if_alone"][0]["modifiers"] is not second["to_if_alone"][0]["modifiers"]
+
+
+def test_compiled_emitter_builds_fresh_rules():
+    config = _dual_config()
+    emit = config.compile()
+    extra = {"type": "variable_if", "name": "extra", "value": 1}
+
+    first = emit(1, 2)
+    second = emit(1, 2, [extra])
+    assert first == compile_rule(config, 1, 2)
+    assert second == compile_rule(config, 1, 2, [extra])
+    assert second["conditions"][-1] is extra
+    assert first["from"] is not second["from"]
+
+
+def test_serialized_action_events_are_not_shared():
+    action = Action("w", ["left_command"])
+    click = ButtonConfig("button5", ButtonBehavior.CLICK, tap_action=action)
+    other = ButtonConfig("button6", ButtonBehavior.CLICK, tap_action=action)
+
+    compile_rule(click, 1, 2)["to"][0]["key_code"] = "ZZ"
+
+    assert compile_rule(other, 1, 2)["to"] == [{"key_code": "w", "modifiers": ["left_command"]}]
+    assert _action_to_json(action) == [{"key_code": "w", "modifiers": ["left_command"]}]
+    assert _action_to_json(action)[0] is not _action_to_json(action)[0]
+    with pytest.raises(TypeError):
+        _serialize_action(action)[0]["key_code"] = "ZZ"
+
+
+# ==============================================================================
+# CONDITION FIELDS
+# ==============================================================================
+
+def test_app_restriction_is_normalized():
+    def restriction(app):
+        return ButtonConfig("button5", ButtonBehavior.CLICK, tap_action=Action("a"), app_restriction=app)
+
+    assert restriction("^com\\.apple\\.Safari$").app_restriction == ("^com\\.apple\\.Safari$",)
+    assert restriction(["^a$", re.compile("^b$")]).app_restriction == ("^a$", "^b$")
+    for empty in ("", [], ()):
+        config = restriction(empty)
+        assert config.app_restriction is None
+        assert [c["type"] for c in compile_rule(config, 1, 2)["conditions"]] == ["device_if"]
+
+    rule = compile_rule(restriction(["^a$"]), 1, 2)
+    assert rule["conditions"][1] == {"type": "frontmost_application_if", "bundle_identifiers": ["^a$"]}
+
+
+def test_layer_condition_is_interned_and_compiled():
+    name = "".join(["layer", "_", "nav"])
+    config = ButtonConfig("button5", ButtonBehavior.CLICK, tap_action=Action("a"), layer_condition=name)
+
+    assert config.layer_condition is sys.intern("layer_nav")
+    assert compile_rule(config, 1, 2)["conditions"][1] == {"type": "variable_if", "name": "layer_nav", "value": 1}
+    assert ButtonConfig("button5", ButtonBehavior.CLICK, tap_action=Action("a"), layer_condition="").layer_condition is None
+
+
+def test_layer_condition_precedes_app_restriction():
+    config = ButtonConfig(
+        "button5", ButtonBehavior.CLICK, tap_action=Action("a"), layer_condition="layer_nav", app_restriction="^a$"
+    )
+    types = [c["type"] for c in compile_rule(config, 1, 2)["conditions"]]
+    assert types == ["device_if", "variable_if", "frontmost_application_if"]
+
+
+def test_app_pattern_flags_are_rejected():
+    assert _bundle_identifiers(re.compile("^a$")) == ("^a$",)
+    assert _bundle_identifiers(re.compile("(?i)^a$")) == ("(?i)^a$",)
+    for pattern in (re.compile("^a$", re.IGNORECASE), re.compile("^a$", re.MULTILINE), re.compile(b"^a$")):
+        with pytest.raises(ValueError):
+            _bundle_identifiers(pattern)
+        with pytest.raises(ValueError):
+            ButtonConfig("button5", ButtonBehavior.CLICK, tap_action=Action("a"), app_restriction=[pattern])
+
+
+# ==============================================================================
+# DEDUPLICATION
+# ==============================================================================
+
+def _manipulator(button, *conditions, kind="basic"):
+    return {"type": kind, "from": {"pointing_button": button}, "conditions": list(conditions), "to": []}
+
+
+_LAYER = {"type": "variable_if", "name": "layer_nav", "value": 1}
+_APP = {"type": "frontmost_application_if", "bundle_identifiers": ["^a$"]}
+
+
+def test_dedupe_drops_exact_duplicates():
+    first = _manipulator("button4", _LAYER)
+    assert dedupe_manipulators([first, _manipulator("button4", _LAYER)]) == [first]
+
+
+def test_dedupe_drops_rules_shadowed_by_fewer_conditions():
+    general = _manipulator("button4", _LAYER)
+    assert dedupe_manipulators([general, _manipulator("button4", _APP, _LAYER)]) == [general]
+    # The narrower rule first still leaves the broader one reachable.
+    narrow = _manipulator("button4", _LAYER, _APP)
+    assert dedupe_manipulators([narrow, general]) == [narrow, general]
+
+
+def test_dedupe_keeps_different_from_and_type():
+    rules = [
+        _manipulator("button4", _LAYER),
+        _manipulator("button5", _LAYER),
+        _manipulator("button4", _LAYER, kind="mouse_motion_to_scroll"),
+    ]
+    assert dedupe_manipulators(rules) == rules
+
+
+def test_dedupe_preserves_order_and_identity():
+    rules = [
+        _manipulator("button5"),
+        _manipulator("button4", _LAYER),
+        _manipulator("button5", _APP),
+        _manipulator("button3", _APP),
+    ]
+    kept = dedupe_manipulators(rules)
+    assert [id(r) for r in kept] == [id(rules[0]), id(rules[1]), id(rules[3])]
+    assert kept is not rules
+
+
+def test_dedupe_ignores_key_order_but_not_bool_vs_int():
+    first = _manipulator("button4", {"type": "variable_if", "name": "layer_nav", "value": 1})
+    reordered = _manipulator("button4", {"value": 1, "name": "layer_nav", "type": "variable_if"})
+    as_bool = _manipulator("button4", {"type": "variable_if", "name": "layer_nav", "value": True})
+    assert dedupe_manipulators([first, reordered, as_bool]) == [first, as_bool]
+
+
+# ==============================================================================
+# NAME INTERNING
+# ==============================================================================
+
+class _Modifier(str, Enum):
+    LEFT_COMMAND = "left_command"
+
+
+def test_str_subclass_names_are_interned_as_plain_strings():
+    action = Action("w", [_Modifier.LEFT_COMMAND])
+    config = ButtonConfig(
+        "button4",
+        ButtonBehavior.DUAL,
+        tap_action=action,
+        layer_variable=_Modifier.LEFT_COMMAND,
+        mandatory_modifiers=(_Modifier.LEFT_COMMAND,),
+        layer_condition=_Modifier.LEFT_COMMAND
+    )
+    for name in (
+        action.modifiers[0],
+        config.layer_variable,
+        config.mandatory_modifiers[0],
+        config.layer_condition,
+        ActionEvent("w", modifiers=(_Modifier.LEFT_COMMAND,)).modifiers[0],
+    ):
+        assert type(name) is str
+        assert name is sys.intern("left_command")
+    assert compile_rule(config)["to_if_alone"][0]["modifiers"] == ["left_command"]
+
+
+# ==============================================================================
+# VALIDATION
+# ==============================================================================
+
+@pytest.mark.parametrize("behavior", [ButtonBehavior.CLICK, ButtonBehavior.DUAL, ButtonBehavior.MODIFIER])
+def test_button_id_list_requires_simultaneous(behavior):
+    with pytest.raises(ValueError):
+        ButtonConfig(["button4", "button5"], behavior, tap_action=Action("a"), layer_variable="layer_nav")
+    config = ButtonConfig(["button4", "button5"], ButtonBehavior.SIMULTANEOUS, tap_action=Action("a"))
+    assert "simultaneous" in compile_rule(config)["from"]
+
+
+def test_bare_string_modifiers_are_rejected():
+    with pytest.raises(ValueError):
+        Action("b", "left_command")
+    with pytest.raises(ValueError):
+        ActionEvent("b", modifiers="left_command")
+    with pytest.raises(ValueError):
+        ButtonConfig("button4", ButtonBehavior.CLICK, tap_action=Action("a"), mandatory_modifiers="left_shift")
+    with pytest.raises(ValueError):
+        ButtonConfig("button4", ButtonBehavior.CLICK, tap_action=Action("a"), optional_modifiers="any")
+    assert Action("b", ["left_command"]).modifiers == ("left_command",)
+
+
+@pytest.mark.parametrize("threshold", [None, -1, 200.0, "200", True])
+def test_invalid_thresholds_raise_value_error(threshold):
+    with pytest.raises(ValueError, match="button3"):
+        ButtonConfig("button3", ButtonBehavior.DUAL, tap_action=Action("a"), layer_variable="L", threshold_ms=threshold)
+    if threshold is not None:
+        with pytest.raises(ValueError, match="button4"):
+            ButtonConfig("button4", ButtonBehavior.CLICK, tap_action=Action("a"), threshold_ms=threshold)
+        with pytest.raises(ValueError, match="simultaneous_threshold_ms"):
+            ButtonConfig("button4", ButtonBehavior.CLICK, simultaneous_threshold_ms=threshold)
+        with pytest.raises(ValueError, match="hold_down_milliseconds"):
+            ActionEvent("a", hold_down_milliseconds=threshold)
+
+
+def test_unused_thresholds_may_be_none():
+    config = ButtonConfig("button4", ButtonBehavior.CLICK, tap_action=Action("a"), threshold_ms=None)
+    assert "parameters" not in compile_rule(config)
+    ButtonConfig(["button4", "button5"], ButtonBehavior.SIMULTANEOUS, simultaneous_threshold_ms=None)
+
+
+def test_button_behavior_renders_as_its_value():
+    assert str(ButtonBehavior.CLICK) == "click"
+    assert f"{ButtonBehavior.CLICK}" == "click"
+    assert f"{ButtonBehavior.DUAL:>6}" == "  dual"
+    assert json.dumps(ButtonBehavior.SIMULTANEOUS) == '"simultaneous"'
+
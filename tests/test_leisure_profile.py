@@ -0,0 +1,302 @@
+import sys
+import json
+from functools import lru_cache, partial
+
+from src.core import (
+    compile_rule,
+    dedupe_manipulators,
+    make_seq,
+    ButtonConfig,
+    ButtonBehavior,
+    Action,
+    ActionEvent
+)
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+VID = 1678
+PID = 181
+
+# compile_rule bound to the target device; every rule in this profile uses it
+compile_device_rule = partial(compile_rule, vid=VID, pid=PID)
+
+LAYER_HYPER = "naga_hyper_wheel"
+LAYER_RMB   = "naga_hyper_rmb"
+
+APP_CHROME   = r"^com\.google\.Chrome$"
+APP_NOTES    = r"^com\.apple\.Notes$"
+APP_SUBLIME  = r"^com\.sublimetext\.4$"
+APP_EMACS    = r"^org\.gnu\.Emacs$"
+APP_OBSIDIAN = r"^md\.obsidian$"
+
+# Shared RMB scopes covering several apps at once. Karabiner matches any entry
+# in bundle_identifiers, so these list the anchored literals above rather than
+# folding them into a regex alternation.
+APP_EDITORS          = (APP_CHROME, APP_NOTES, APP_SUBLIME)
+APP_EDITORS_OBSIDIAN = (APP_CHROME, APP_NOTES, APP_SUBLIME, APP_OBSIDIAN)
+APP_RMB_SCOPE        = (APP_CHROME, APP_NOTES, APP_SUBLIME, APP_EMACS, APP_OBSIDIAN)
+
+# Modifier sets, shared by every binding that uses them (order is emitted as-is)
+MOD_SHIFT          = ("left_shift",)
+MOD_CTRL           = ("left_control",)
+MOD_CMD            = ("left_command",)
+MOD_CMD_SHIFT      = ("left_command", "left_shift")
+MOD_CMD_OPT        = ("left_command", "left_option")
+MOD_OPT_SHIFT      = ("left_option", "left_shift")
+MOD_OPT_SHIFT_CMD  = ("left_option", "left_shift", "left_command")
+MOD_CTRL_OPT_SHIFT = ("left_control", "left_option", "left_shift")
+
+# ==============================================================================
+# BUTTON MAP
+# ==============================================================================
+
+@lru_cache(maxsize=None)
+def _ev(key_code, modifiers=()):
+    """
+    Returns a shared ActionEvent for a key press; events are immutable.
+    """
+    return ActionEvent(key_code, modifiers)
+
+def _spc(*keys):
+    """
+    Builds an Emacs leader sequence: SPC followed by each key in turn.
+    """
+    return make_seq([_ev("spacebar"), *map(_ev, keys)])
+
+# One CLICK rule per row: (button, action, layer, app). A layer or app of None
+# leaves that condition off. Rows for a button run from most to least specific,
+# since Karabiner applies the first matching manipulator.
+
+# --- ROW 1: NAVIGATION & FILES ---
+ROW_NAVIGATION = (
+    # Button 1: Left / Back
+    ("1", Action("1", MOD_OPT_SHIFT), LAYER_HYPER, None),
+    ("1", _spc("f", "r"), LAYER_RMB, APP_EMACS),
+    ("1", Action("open_bracket", MOD_CMD), LAYER_RMB, APP_OBSIDIAN),              # Navigate Back
+    ("1", Action("open_bracket", MOD_CMD_SHIFT), LAYER_RMB, APP_EDITORS),         # Tab Left
+    ("1", Action("left_arrow", MOD_CTRL), None, None),
+
+    # Button 2: Center / Overview
+    ("2", Action("2", MOD_OPT_SHIFT), LAYER_HYPER, None),
+    ("2", _spc("f", "d"), LAYER_RMB, APP_EMACS),
+    ("2", Action("e", MOD_CMD), LAYER_RMB, APP_OBSIDIAN),                         # Toggle Read/Edit Mode
+    ("2", Action("t", MOD_CMD_SHIFT), LAYER_RMB, APP_CHROME),
+    ("2", Action("s", MOD_CMD), LAYER_RMB, APP_SUBLIME),
+    ("2", Action("s", MOD_CMD_OPT), LAYER_RMB, APP_NOTES),
+    ("2", Action("up_arrow", MOD_CTRL), None, None),
+
+    # Button 3: Right / Forward
+    ("3", Action("return_or_enter", MOD_CTRL_OPT_SHIFT), LAYER_HYPER, None),
+    ("3", _spc("f", "f"), LAYER_RMB, APP_EMACS),
+    ("3", Action("close_bracket", MOD_CMD), LAYER_RMB, APP_OBSIDIAN),             # Navigate Forward
+    ("3", Action("close_bracket", MOD_CMD_SHIFT), LAYER_RMB, APP_EDITORS),
+    ("3", Action("right_arrow", MOD_CTRL), None, None),
+)
+
+# --- ROW 2: ACTION & EDITING ---
+ROW_EDITING = (
+    # Button 4: Copy / Pull / Seek Back
+    ("4", Action("x", MOD_CMD), LAYER_HYPER, None),
+    ("4", Action("left_arrow"), LAYER_RMB, APP_CHROME),                           # Seek Backward
+    ("4", Action("l", MOD_CMD), LAYER_RMB, APP_OBSIDIAN),                         # Toggle Checkbox
+    ("4", make_seq([_ev("f", MOD_SHIFT), _ev("p")]), LAYER_RMB, APP_EMACS),
+    ("4", Action("d", MOD_CMD_SHIFT), LAYER_RMB, APP_SUBLIME),
+    ("4", Action("l", MOD_CMD_SHIFT), LAYER_RMB, APP_NOTES),
+    ("4", Action("c", MOD_CMD), None, None),
+
+    # Button 5: Undo / Cycle
+    ("5", make_seq([
+        _ev("left_arrow", MOD_CMD_SHIFT),
+        _ev("right_arrow", MOD_CMD_SHIFT)
+    ]), LAYER_HYPER, None),
+    ("5", _spc("w", "w"), LAYER_RMB, APP_EMACS),
+    ("5", Action("escape"), LAYER_RMB, APP_EDITORS_OBSIDIAN),
+    ("5", Action("z", MOD_CMD), None, None),
+
+    # Button 6: Paste / Commit / Seek Fwd
+    ("6", Action("v", MOD_OPT_SHIFT_CMD), LAYER_HYPER, None),
+    ("6", Action("right_arrow"), LAYER_RMB, APP_CHROME),                          # Seek Forward
+    ("6", Action("a", MOD_CMD), LAYER_RMB, APP_OBSIDIAN),                         # Select All
+    ("6", make_seq([_ev("c"), _ev("c")]), LAYER_RMB, APP_EMACS),
+    ("6", Action("close_bracket", MOD_CMD), LAYER_RMB, APP_NOTES),                # Indent
+    ("6", Action("v", MOD_CMD_SHIFT), LAYER_RMB, APP_SUBLIME),                    # Paste
+    ("6", Action("v", MOD_CMD), None, None),
+)
+
+# --- ROW 3: LIFECYCLE ---
+ROW_LIFECYCLE = (
+    # Button 7: Start / New
+    ("7", Action("play_or_pause"), LAYER_HYPER, None),                            # Play/Pause
+    ("7", _spc("q", "r"), LAYER_RMB, APP_EMACS),
+    ("7", Action("t", MOD_CMD), LAYER_RMB, APP_CHROME),                           # New Tab
+    ("7", Action("d", MOD_CMD_SHIFT), LAYER_RMB, APP_OBSIDIAN),                   # Daily Note
+    ("7", Action("n", MOD_CMD), LAYER_RMB, APP_NOTES),                            # Pin Note (placeholder)
+    ("7", Action("n", MOD_CMD), None, None),                                      # New Window
+
+    # Button 8: Enter / Status
+    ("8", Action("r", MOD_CMD), LAYER_HYPER, None),
+    ("8", _spc("g", "g"), LAYER_RMB, APP_EMACS),
+    ("8", Action("r", MOD_CMD_SHIFT), LAYER_RMB, APP_CHROME),
+    ("8", Action("p", MOD_CMD), LAYER_RMB, APP_OBSIDIAN),                         # Command Palette
+    ("8", Action("p", MOD_CMD_SHIFT), LAYER_RMB, APP_SUBLIME),
+    ("8", Action("3", MOD_CMD), LAYER_RMB, APP_NOTES),
+    ("8", Action("return_or_enter"), None, None),
+
+    # Button 9: Close / Quit
+    ("9", Action("escape", MOD_CMD_OPT), LAYER_HYPER, None),
+    ("9", _spc("q", "q"), LAYER_RMB, APP_EMACS),
+    ("9", Action("w", MOD_CMD), LAYER_RMB, APP_EDITORS_OBSIDIAN),
+    ("9", Action("w", MOD_CMD), None, None),
+)
+
+# --- ROW 4: TOOLS & REMOTE ---
+ROW_TOOLS = (
+    # Button 10: Find / Search
+    ("0", Action("f", MOD_CMD), LAYER_HYPER, None),
+    ("0", _spc("slash"), LAYER_RMB, APP_EMACS),
+    ("0", make_seq([
+        _ev("c", MOD_CMD),
+        _ev("t", MOD_CMD),
+        _ev("v", MOD_CMD),
+        _ev("return_or_enter")
+    ]), LAYER_RMB, APP_CHROME),
+    ("0", Action("o", MOD_CMD), LAYER_RMB, APP_OBSIDIAN),                         # Quick Switcher
+    ("0", Action("o", MOD_CMD), LAYER_RMB, APP_SUBLIME),
+    ("0", Action("f", MOD_CMD_OPT), LAYER_RMB, APP_NOTES),
+    ("0", make_seq([
+        _ev("c", MOD_CMD),
+        _ev("f", MOD_CMD),
+        _ev("v", MOD_CMD),
+        ActionEvent("return_or_enter", hold_down_milliseconds=20)
+    ]), None, None),
+
+    # Button 11: Vol Down / Switch
+    ("hyphen", Action("display_brightness_decrement"), LAYER_HYPER, None),
+    ("hyphen", _spc("b", "b"), LAYER_RMB, APP_EMACS),
+    ("hyphen", make_seq([_ev("open_bracket"), _ev("open_bracket")]), LAYER_RMB, APP_OBSIDIAN),  # Link [[
+    ("hyphen", Action("d", MOD_CMD), LAYER_RMB, APP_CHROME),
+    ("hyphen", Action("slash", MOD_CMD), LAYER_RMB, APP_SUBLIME),
+    ("hyphen", Action("k", MOD_CMD), LAYER_RMB, APP_NOTES),
+    ("hyphen", Action("volume_decrement"), None, None),
+
+    # Button 12: Vol Up / Ship It
+    ("equal_sign", Action("display_brightness_increment"), LAYER_HYPER, None),
+    ("equal_sign", Action("n", MOD_CMD_SHIFT), LAYER_RMB, APP_CHROME),
+    ("equal_sign", make_seq([_ev("p", MOD_SHIFT), _ev("p")]), LAYER_RMB, APP_EMACS),
+    ("equal_sign", Action("open_bracket", MOD_CMD_OPT), LAYER_RMB, APP_OBSIDIAN),  # Fold/Unfold
+    ("equal_sign", Action("a", MOD_CMD), LAYER_RMB, APP_SUBLIME),
+    ("equal_sign", Action("volume_increment"), None, None),
+)
+
+LEISURE_RULES = ROW_NAVIGATION + ROW_EDITING + ROW_LIFECYCLE + ROW_TOOLS
+
+def _build_click_rule(button, action, layer, app):
+    """
+    Compiles one LEISURE_RULES row into a manipulator with its conditions.
+    """
+    return compile_device_rule(
+        ButtonConfig(button, ButtonBehavior.CLICK, action, layer_condition=layer, app_restriction=app)
+    )
+
+def build_leisure_profile():
+    """
+    Builds the MouseMapper V4.2 'Leisure Audit' Profile as a JSON-ready dict.
+    """
+    # ==========================================================================
+    # 1. LAYER DEFINITIONS
+    # ==========================================================================
+
+    # Global Hyper: Scroll Wheel (Button 3)
+    r_hyper = compile_device_rule(
+        ButtonConfig("button3", ButtonBehavior.DUAL, tap_action=Action("button3"), layer_variable=LAYER_HYPER, threshold_ms=200)
+    )
+
+    # Context Layer: Right Click (Button 2)
+    # Scoped by app only, with no device condition
+    r_rmb = compile_rule(ButtonConfig(
+        "button2", ButtonBehavior.DUAL, tap_action=Action("button2"), layer_variable=LAYER_RMB, threshold_ms=150,
+        app_restriction=APP_RMB_SCOPE
+    ))
+
+    # ==========================================================================
+    # 2. BUTTON MAP
+    # ==========================================================================
+
+    # Built in one pass: layer definitions first, then every table row in order.
+    # No row may be shadowed by an earlier, broader binding; the tests check this.
+    manipulators = [r_hyper, r_rmb, *(_build_click_rule(*row) for row in LEISURE_RULES)]
+
+    # ==========================================================================
+    # OUTPUT
+    # ==========================================================================
+    return {
+        "title": "test v4.2",
+        "rules": [
+            {
+                "description": "MouseMapper V4.2",
+                "manipulators": manipulators
+            }
+        ]
+    }
+
+
+def generate_leisure_profile(output_path=None):
+    """
+    Generates the MouseMapper V4.2 'Leisure Audit' Profile and prints it.
+
+    When output_path is given, the profile is written to that file instead.
+    """
+    # Rules never form cycles, so the encoder's cycle tracking is pure
+    # overhead; leave non-ASCII unescaped.
+    text = json.dumps(build_leisure_profile(), indent=2, check_circular=False, ensure_ascii=False)
+    output = (text + "\n").encode("utf-8")
+
+    if output_path:
+        with open(output_path, "wb") as f:
+            f.write(output)
+        return
+
+    # The profile is kept as UTF-8 bytes, so write them straight to the binary
+    # buffer in one call rather than decoding and re-encoding through the
+    # text layer.
+    sys.stdout.flush()
+    sys.stdout.buffer.write(output)
+    sys.stdout.buffer.flush()
+
+
+def test_generate_leisure_profile(capsys):
+    """
+    The profile is built and printed as UTF-8 JSON.
+    """
+    generate_leisure_profile()
+    printed = json.loads(capsys.readouterr().out)
+    assert printed["title"] == "test v4.2"
+    assert printed == json.loads(json.dumps(build_leisure_profile()))
+
+
+def test_generate_leisure_profile_output_path(tmp_path, capsys):
+    """
+    With output_path the profile goes to that file and nothing is printed.
+    """
+    output_path = tmp_path / "leisure.json"
+    generate_leisure_profile(str(output_path))
+    assert capsys.readouterr().out == ""
+    generate_leisure_profile()
+    assert output_path.read_text(encoding="utf-8") == capsys.readouterr().out
+    assert json.loads(output_path.read_text(encoding="utf-8"))["title"] == "test v4.2"
+
+
+def test_leisure_profile_has_no_shadowed_rules():
+    """
+    Every manipulator is reachable: none is shadowed by an earlier, broader one.
+    """
+    manipulators = build_leisure_profile()["rules"][0]["manipulators"]
+    assert dedupe_manipulators(manipulators) == manipulators
+
+
+if __name__ == "__main__":
+    # Usage, from the repository root:
+    #   python -m tests.test_leisure_profile [OUTPUT_PATH]  (defaults to stdout)
+    generate_leisure_profile(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,177 @@
+import plistlib
+import signal
+import subprocess
+
+import pytest
+
+import scanner
+
+# ==============================================================================
+# SCAN CACHE
+# ==============================================================================
+
+_NAGA = {"idVendor": 1678, "idProduct": 181, "USB Product Name": "Naga", "locationID": 1}
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """
+    Starts each test with an empty scan cache, a controllable clock and a
+    registry stub that counts its calls.
+    """
+    monkeypatch.setitem(scanner._scan_cache, "devices", None)
+    monkeypatch.setitem(scanner._scan_cache, "timestamp", 0.0)
+    clock = {"now": 100.0}
+    monkeypatch.setattr(scanner.time, "monotonic", lambda: clock["now"])
+    calls = []
+
+    def get_usb_registry():
+        calls.append(clock["now"])
+        return [dict(_NAGA)]
+
+    monkeypatch.setattr(scanner, "get_usb_registry", get_usb_registry)
+    return clock, calls
+
+
+def test_scan_is_reused_within_ttl(registry):
+    clock, calls = registry
+    first = scanner.scan_devices()
+    clock["now"] += scanner._SCAN_TTL_SECONDS - 0.1
+    assert scanner.scan_devices() == first
+    assert len(calls) == 1
+
+    clock["now"] += 0.1
+    scanner.scan_devices()
+    assert len(calls) == 2
+
+
+def test_force_bypasses_cache(registry):
+    _, calls = registry
+    scanner.scan_devices()
+    scanner.scan_devices(force=True)
+    assert len(calls) == 2
+
+
+def test_scan_returns_copies(registry):
+    first = scanner.scan_devices()
+    first[0]["name"] = "changed"
+    first.append({})
+
+    second = scanner.scan_devices()
+    assert second == [{"name": "Naga", "vendor_id": 1678, "product_id": 181, "location_id": 1}]
+    assert second[0] is not scanner.scan_devices()[0]
+
+
+def test_failed_scan_is_not_cached(registry, monkeypatch):
+    def fail():
+        raise subprocess.CalledProcessError(1, ["ioreg"])
+
+    monkeypatch.setattr(scanner, "get_usb_registry", fail)
+    assert scanner.scan_devices() == []
+    assert scanner._scan_cache["devices"] is None
+
+
+# ==============================================================================
+# IOREG ARCHIVE
+# ==============================================================================
+
+_ARCHIVE = plistlib.dumps({"IORegistryEntryChildren": [_NAGA]}, fmt=plistlib.FMT_BINARY)
+
+
+class _FakeStdout:
+    def close(self):
+        pass
+
+
+def _fake_pipeline(monkeypatch, ioreg_rc, plutil_rc, stdout=_ARCHIVE, stderr=b""):
+    class FakePopen:
+        def __init__(self, cmd, stdout=None):
+            self.stdout = _FakeStdout()
+
+        def wait(self):
+            return ioreg_rc
+
+    def fake_run(cmd, stdin=None, capture_output=False):
+        return subprocess.CompletedProcess(cmd, plutil_rc, stdout, stderr)
+
+    monkeypatch.setattr(scanner.subprocess, "Popen", FakePopen)
+    monkeypatch.setattr(scanner.subprocess, "run", fake_run)
+
+
+@pytest.mark.parametrize("ioreg_rc", [0, -signal.SIGPIPE])
+def test_archive_is_parsed(monkeypatch, ioreg_rc):
+    _fake_pipeline(monkeypatch, ioreg_rc, 0)
+    assert scanner._read_ioreg_archive() == {"IORegistryEntryChildren": [_NAGA]}
+
+
+def test_plutil_error_wins_over_sigpipe(monkeypatch):
+    _fake_pipeline(monkeypatch, -signal.SIGPIPE, 1, stdout=b"", stderr=b"bad plist")
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        scanner._read_ioreg_archive()
+    assert excinfo.value.cmd[0] == "plutil"
+    assert excinfo.value.stderr == b"bad plist"
+    assert excinfo.value.__cause__ is None
+
+
+def test_plutil_error_wins_over_ioreg_failure(monkeypatch):
+    _fake_pipeline(monkeypatch, 3, 1, stdout=b"", stderr=b"truncated")
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        scanner._read_ioreg_archive()
+    assert excinfo.value.cmd[0] == "plutil"
+    assert excinfo.value.stderr == b"truncated"
+    assert excinfo.value.__cause__.cmd[0] == "ioreg"
+    assert excinfo.value.__cause__.returncode == 3
+
+
+def test_ioreg_failure_alone_is_reported(monkeypatch):
+    _fake_pipeline(monkeypatch, 3, 0)
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        scanner._read_ioreg_archive()
+    assert excinfo.value.cmd[0] == "ioreg"
+    assert excinfo.value.returncode == 3
+
+
+def test_registry_falls_back_to_ioreg(monkeypatch):
+    def broken():
+        raise OSError("symbol mismatch")
+
+    _fake_pipeline(monkeypatch, 0, 0)
+    monkeypatch.setattr(scanner, "_read_iokit_devices", broken)
+    assert scanner.get_usb_registry() == {"IORegistryEntryChildren": [_NAGA]}
+    monkeypatch.setattr(scanner, "_read_iokit_devices", lambda: [dict(_NAGA)])
+    assert scanner.get_usb_registry() == [_NAGA]
+
+
+# ==============================================================================
+# TRAVERSAL
+# ==============================================================================
+
+def _device(vid, *children):
+    return {"idVendor": vid, "idProduct": vid, "IORegistryEntryChildren": list(children)}
+
+
+def test_traversal_is_pre_order():
+    root = {"IORegistryEntryChildren": [_device(1, _device(2, _device(3)), _device(4)), _device(5)]}
+    found = []
+    scanner.traverse_registry(root, found)
+    assert [d["vendor_id"] for d in found] == [1, 2, 3, 4, 5]
+
+
+def test_traversal_skips_nodes_without_integer_ids():
+    root = {"IORegistryEntryChildren": [
+        {"idVendor": "1678", "idProduct": 181},
+        {"idVendor": 1678},
+        {"idVendor": 1678, "idProduct": 181, "kUSBProductString": "Naga"},
+    ]}
+    found = []
+    scanner.traverse_registry(root, found)
+    assert found == [{"name": "Naga", "vendor_id": 1678, "product_id": 181, "location_id": 0}]
+
+
+def test_traversal_handles_chains_deeper_than_the_recursion_limit():
+    node = _device(1)
+    for _ in range(5000):
+        node = {"IORegistryEntryChildren": [node]}
+    found = []
+    scanner.traverse_registry(node, found)
+    assert [d["vendor_id"] for d in found] == [1]